@@ -2,8 +2,10 @@ import streamlit as st
 import time
 from datetime import datetime, timedelta
 import traceback
+import importlib
 import sys
 import os
+from pages import instrumentation
 
 # Set page config with white background
 st.set_page_config(
@@ -20,13 +22,22 @@ MAINTENANCE_MODE = False
 if 'stored_data' not in st.session_state:
     st.session_state.stored_data = {}
 
-def save_data(path, info):
-    """Save data to session state"""
-    st.session_state.stored_data[path] = info
-
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
+# Sidebar options and the pages/ module behind each; a module is imported the first time its page is opened
+PAGES = {
+    "Upload PDF": "upload_pdf",
+    "Performance Dashboard": "dashboard",
+    "View Top Students": "top_students",
+    "Division Analysis": "division_analysis",
+    "Pass/Fail Analysis": "pass_fail_analysis",
+    "Subject-wise Analysis": "subject_analysis",
+    "Student Search": "student_search",
+    "Generate Excel Report": "excel_report",
+    "Compare Datasets": "compare_datasets",
+    "Background Jobs": "job_status",
+}
+# Timings and profiles are only collected (and shown) when RESULT_INSTRUMENTATION is set
+if instrumentation.ENABLED:
+    PAGES["Instrumentation"] = "admin"
 
 def show_maintenance_page():
     st.title("🔧 College Result Management System")
@@ -73,54 +84,29 @@ def show_maintenance_page():
 
 def show_main_app():
     try:
-        # Try to import page modules
-        try:
-            # Add the pages directory to Python path
-            pages_dir = os.path.join(os.path.dirname(__file__), 'pages')
-            if pages_dir not in sys.path:
-                sys.path.append(pages_dir)
-            
-            # Import all page modules
-            from pages import upload_pdf, dashboard, top_students, division_analysis, pass_fail_analysis, subject_analysis, student_search, excel_report
-        except ImportError as e:
-            st.error(f"Error importing page modules: {str(e)}")
-            st.info("Please make sure all page files exist in the 'pages' directory")
-            return
+        # Add the pages directory to Python path
+        pages_dir = os.path.join(os.path.dirname(__file__), 'pages')
+        if pages_dir not in sys.path:
+            sys.path.append(pages_dir)
         
         st.title("🎓 College Result Management System")
         st.markdown("---")
         
         st.sidebar.title("Navigation")
-        menu_options = [
-            "Upload PDF",
-            "Performance Dashboard",
-            "View Top Students",
-            "Division Analysis",
-            "Pass/Fail Analysis",
-            "Subject-wise Analysis",
-            "Student Search",
-            "Generate Excel Report"
-        ]
-        choice = st.sidebar.selectbox("Select Option", menu_options)
+        choice = st.sidebar.selectbox("Select Option", list(PAGES), key="page")
+        
+        # Only the selected page's module (and its heavy dependencies) is imported
+        try:
+            page = importlib.import_module(f"pages.{PAGES[choice]}")
+        except ImportError as e:
+            st.error(f"Error importing page modules: {str(e)}")
+            st.info("Please make sure all page files exist in the 'pages' directory")
+            return
         
         # Route to the appropriate page with error handling
         try:
-            if choice == "Upload PDF":
-                upload_pdf.show()
-            elif choice == "Performance Dashboard":
-                dashboard.show()
-            elif choice == "View Top Students":
-                top_students.show()
-            elif choice == "Division Analysis":
-                division_analysis.show()
-            elif choice == "Pass/Fail Analysis":
-                pass_fail_analysis.show()
-            elif choice == "Subject-wise Analysis":
-                subject_analysis.show()
-            elif choice == "Student Search":
-                student_search.show()
-            elif choice == "Generate Excel Report":
-                excel_report.show()
+            with instrumentation.timed(f"page:{choice}", profile=True):
+                page.show()
         except Exception as e:
             st.error(f"Error in {choice} page: {str(e)}")
             st.code(traceback.format_exc())
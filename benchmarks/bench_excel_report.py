@@ -0,0 +1,73 @@
+"""Benchmark for the Excel report on a large synthetic cohort.
+
+Builds the dataset straight from synthetic records (no PDF rendering or
+extraction), then times excel_report.build_excel_report against the
+previous in-memory Workbook version kept below, checks both produce the
+same cells, and reports rows/sec and peak memory.
+
+    python benchmarks/bench_excel_report.py [--students 10000] [--subjects 9]
+"""
+import argparse
+import os
+import sys
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from pages.excel_report import build_excel_report, report_rows
+from pages.result_dataset import build_dataset, subject_code
+from run_benchmarks import measure
+from synthetic_pdf import generate_records
+
+def buffered_report(dataset):
+    """The report before streaming: a normal Workbook saved into a BytesIO, kept for comparison"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Student Results"
+
+    header = ["Seat No", "Name"]
+    for subject in dataset.subjects:
+        header.extend([subject_code(subject), "UA", "CA", "Total", "Subject_Status"])
+    header.extend(["", "Total", "Status", "Percentage"])
+    ws.append(header)
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+
+    for cells in report_rows(dataset):
+        ws.append(cells)
+        ws[f"A{ws.max_row}"].font = Font(bold=True)
+
+    excel_buffer = BytesIO()
+    wb.save(excel_buffer)
+    excel_buffer.seek(0)
+    return excel_buffer
+
+def read_cells(excel_file):
+    return [list(row) for row in load_workbook(excel_file, read_only=True).active.iter_rows(values_only=True)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Excel report")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--subjects", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = build_dataset(generate_records(args.students, args.subjects, seed=args.seed))
+    print(f"{'report':12} {'students':>9} {'seconds':>9} {'rows/s':>10} {'peak MB':>8}")
+    outputs = {}
+    for name, build in (("buffered", buffered_report), ("streaming", build_excel_report)):
+        excel_file, seconds, peak = measure(build, dataset)
+        outputs[name] = excel_file
+        peak_text = f"{peak:8.1f}" if peak is not None else f"{'n/a':>8}"
+        print(f"{name:12} {args.students:>9} {seconds:>9.3f} {args.students / seconds:>10,.0f} {peak_text}")
+
+    same = read_cells(outputs["buffered"]) == read_cells(outputs["streaming"])
+    print("output matches" if same else "OUTPUT MISMATCH")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
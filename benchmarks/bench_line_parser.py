@@ -0,0 +1,139 @@
+"""Micro-benchmark for the per-line result page parser.
+
+Compares the original two-pass substring/regex cascade (including its
+per-page DataFrame round-trip) with upload_pdf.parse_result_lines on
+synthetic page text and reports lines/sec.
+
+    python benchmarks/bench_line_parser.py [--pages 2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.upload_pdf import parse_result_lines
+
+SUBJECTS = ["BCA-301", "BCA-302", "BCA-303", "ECS-304", "CC-305", "ENG-306", "ENS-307", "SEC-308", "BCA-309"]
+
+def legacy_parse_lines(lines):
+    """The extractor's page handling before the single-pass classifier, kept for comparison"""
+    all_student_data = []
+    student_info = {}
+    for line in lines:
+        if re.match(r'^\d+\.\s+[A-Z\s]+$', line.strip()):
+            student_info['Name'] = line.split('.', 1)[1].strip()
+        if 'Seat No:' in line and 'PRN No.' in line and 'College Code:' in line:
+            seat_no_match = re.search(r'Seat No:\s*(\d+)', line)
+            if seat_no_match:
+                student_info['Seat No'] = seat_no_match.group(1)
+        if 'PRN No.' in line:
+            student_info['PRN No'] = line.split('PRN No.')[-1].split()[0].strip()
+        if 'Status:' in line:
+            student_info['Status'] = line.split('Status:')[-1].split()[0].strip()
+        if 'Percentage:' in line:
+            percentage_part = line.split('Percentage:')[-1].split('%')[0].strip()
+            student_info['Percentage'] = f"{percentage_part}"
+
+    for line in lines:
+        if any(code in line for code in ['BCA', 'ECS', 'CC-', 'ENG-', 'ENS', 'SEC']):
+            words = line.split()
+            parts = []
+            i = 0
+            while i < len(words):
+                if words[i] == '*' and i + 1 < len(words) and words[i + 1].isdigit():
+                    parts.append(f'* {words[i + 1]}')
+                    i += 2
+                elif (words[i] == '$' and i + 3 < len(words) and words[i + 1].isdigit() and
+                      words[i + 2].startswith('+') and words[i + 2][1:].isdigit()):
+                    parts.append(str(int(words[i + 1]) + int(words[i + 2][1:])))
+                    i += 3
+                elif (words[i].isdigit() and i + 2 < len(words) and
+                      words[i + 1] == '+' and words[i + 2].isdigit()):
+                    parts.append(str(int(words[i]) + int(words[i + 2])))
+                    i += 3
+                elif words[i].startswith('+') and words[i][1:].isdigit():
+                    parts.append(words[i][1:])
+                    i += 1
+                elif words[i] in ['$', '+']:
+                    i += 1
+                else:
+                    parts.append(words[i])
+                    i += 1
+            all_student_data.append({
+                'Code': parts[0] if len(parts) > 0 else '',
+                'UA': parts[3] if len(parts) > 3 else '',
+                'CA': parts[5] if len(parts) > 5 else '',
+                'Total': parts[8] if len(parts) > 8 else '',
+                'Status': parts[-2] if len(parts) > 12 else ''
+            })
+    # Each page's rows used to go through a DataFrame just to get the columns back as lists
+    all_Data = pd.DataFrame(all_student_data)
+    return student_info, {
+        'Code': all_Data['Code'].tolist(),
+        'UA': all_Data['UA'].tolist(),
+        'CA': all_Data['CA'].tolist(),
+        'Total': all_Data['Total'].tolist(),
+        'Status1': all_Data['Status'].tolist()
+    }
+
+def synthetic_page_lines(seq, rng):
+    """Lines shaped like pdfplumber's text for one student page"""
+    lines = [
+        "SHIVAJI UNIVERSITY, KOLHAPUR",
+        f"{seq}. STUDENT {chr(65 + seq % 26) * 5} SURNAME",
+        f"Seat No: {100000 + seq} PRN No. 2021{seq:06d} College Code: SANG",
+    ]
+    for code in SUBJECTS:
+        ua, ca = rng.randint(10, 60), rng.randint(5, 20)
+        quirk = rng.random()
+        if quirk < 0.05:
+            ua_token = f"* {ua}"
+        elif quirk < 0.10:
+            ua_token = f"$ {ua} +2"
+            ua += 2
+        elif quirk < 0.12:
+            ua_token = "AB"
+        else:
+            ua_token = str(ua)
+        status = "P" if ua + ca >= 40 else "F"
+        lines.append(f"{code} 4 T {ua_token} 60 {ca} 20 80 {ua + ca} A 8 32 {status} 4")
+    lines.append(f"Status: Pass Percentage: {rng.uniform(35, 95):.2f} %")
+    return lines
+
+def lines_per_second(parse, pages, repeat):
+    line_count = sum(len(lines) for lines in pages)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for lines in pages:
+            parse(lines)
+        best = min(best, time.perf_counter() - started)
+    return line_count / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pages = [synthetic_page_lines(seq, rng) for seq in range(1, args.pages + 1)]
+
+    for lines in pages:
+        assert parse_result_lines(lines) == legacy_parse_lines(lines), lines
+
+    before = lines_per_second(legacy_parse_lines, pages, args.repeat)
+    after = lines_per_second(parse_result_lines, pages, args.repeat)
+    print(f"lines: {sum(len(lines) for lines in pages)}")
+    print(f"legacy cascade   : {before:12,.0f} lines/sec")
+    print(f"single pass      : {after:12,.0f} lines/sec")
+    print(f"speedup          : {after / before:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark for re-ingesting a result PDF reissued after revaluation.
+
+Parses a synthetic PDF, then a copy in which a few students' marks were
+revaluated, once from scratch and once reusing the records of pages whose
+content hash was already seen (the app looks these up in the result store;
+here they are kept in memory). Both parses are checked against the
+generator's records, and the students reported as changed against the
+ones that were revaluated.
+
+    python benchmarks/bench_revision.py [--students 2000] [--revised 20] [--workers 1]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pages.comparison import mark_changes
+from pages.result_dataset import build_dataset
+from pages.upload_pdf import add_page_records, iter_page_records
+from run_benchmarks import measure
+from synthetic_pdf import generate_result_pdf
+
+def parse(source, workers, reuse=None):
+    """(student_info, pages) of a PDF, taking pages found by reuse from it"""
+    student_info, pages = [], []
+    for _, _, page_records in iter_page_records(source, workers, reuse):
+        add_page_records(page_records, student_info, pages)
+    return student_info, pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental re-ingest of a revised result PDF")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--revised", type=int, default=20, help="students whose marks change in the reissue")
+    parser.add_argument("--subjects", type=int, default=9)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    revised = random.Random(args.seed).sample(range(args.students), args.revised)
+    original, original_records = generate_result_pdf(args.students, args.subjects, seed=args.seed)
+    reissue, expected = generate_result_pdf(args.students, args.subjects, seed=args.seed, revised=revised)
+
+    student_info, pages = parse(original, args.workers)
+    known = {content_hash: None if row is None else student_info[row] for _, content_hash, row in pages}
+    lookups = []
+    def reuse(hashes):
+        found = {content_hash: known[content_hash] for content_hash in hashes if content_hash in known}
+        lookups.append(len(hashes) - len(found))
+        return found
+
+    print(f"{'parse':12} {'pages':>6} {'re-read':>8} {'seconds':>9} {'pages/s':>9}")
+    (full, _), full_seconds, _ = measure(parse, reissue, args.workers)
+    print(f"{'full':12} {len(pages):>6} {len(pages):>8} {full_seconds:>9.3f} {len(pages) / full_seconds:>9.1f}")
+    (incremental, _), seconds, _ = measure(parse, reissue, args.workers, reuse)
+    print(f"{'incremental':12} {len(pages):>6} {lookups[-1]:>8} {seconds:>9.3f} {len(pages) / seconds:>9.1f}"
+          f"  {full_seconds / seconds:.1f}x faster")
+
+    changes = mark_changes(build_dataset(original_records), build_dataset(incremental))
+    changed = {str(100001 + i) for i, (old, new) in enumerate(zip(original_records, expected)) if old != new}
+    ok = full == expected and incremental == expected and set(changes['Seat No']) == changed
+    print(f"{len(changes)} student(s) reported changed, {len(changed)} revaluated")
+    print("output matches" if ok else "OUTPUT MISMATCH")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
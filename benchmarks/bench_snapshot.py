@@ -0,0 +1,74 @@
+"""Benchmark for reloading a stored dataset from its Arrow snapshot.
+
+Stores a large synthetic cohort in a temporary result store, then times
+the ways an upload can be opened again: rebuilding it from the SQLite rows
+(what every cold start did before snapshots), building it from the parsed
+records (a parse-cache hit), and memory-mapping its snapshot file, plus
+the typed summary every page builds first. The reloaded dataset is checked
+against the original.
+
+    python benchmarks/bench_snapshot.py [--students 50000] [--subjects 9]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+def same_dataset(a, b):
+    """True if two datasets hold the same students, subjects, marks and cell tokens"""
+    return (a.subjects == b.subjects
+            and a.students.equals(b.students)
+            and np.array_equal(a.taken, b.taken)
+            and np.array_equal(a.position, b.position)
+            and a.status.equals(b.status)
+            and all(np.array_equal(a.marks[field], b.marks[field]) and np.array_equal(a.absent[field], b.absent[field])
+                    for field in a.marks)
+            and all(np.array_equal(a.tokens[field], b.tokens[field]) for field in a.tokens))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reloading a stored dataset")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--subjects", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The store reads its location when imported
+        os.environ["RESULT_DB_PATH"] = os.path.join(tmp, "results.sqlite3")
+        os.environ["RESULT_SNAPSHOT_DIR"] = os.path.join(tmp, "snapshots")
+        from pages import storage
+        from pages.result_dataset import build_dataset
+        from pages.snapshot import read_snapshot
+        from run_benchmarks import measure
+        from synthetic_pdf import generate_records
+
+        records = generate_records(args.students, args.subjects, seed=args.seed)
+        upload_id = storage.store_results(records, key="bench-snapshot", name="synthetic.pdf")
+        original = storage.load_dataset(upload_id)
+        path = storage._snapshot_path(upload_id)
+        print(f"{args.students} students, snapshot {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        def from_database():
+            return build_dataset(storage._read_records(upload_id), key="bench-snapshot")
+
+        print(f"{'reload':16} {'seconds':>9} {'+summary s':>11} {'peak MB':>8}")
+        ok = True
+        for name, load in (("sqlite rows", from_database),
+                           ("parsed records", lambda: build_dataset(records, key="bench-snapshot")),
+                           ("arrow snapshot", lambda: read_snapshot(path))):
+            dataset, seconds, peak = measure(load)
+            _, summary_seconds, _ = measure(lambda: dataset.summary)
+            ok = ok and same_dataset(original, dataset)
+            peak_text = f"{peak:8.1f}" if peak is not None else f"{'n/a':>8}"
+            print(f"{name:16} {seconds:>9.3f} {summary_seconds:>11.3f} {peak_text}")
+
+    print("output matches" if ok else "OUTPUT MISMATCH")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
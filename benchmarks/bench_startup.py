@@ -0,0 +1,109 @@
+"""Startup benchmark: first-render latency of each page of the app.
+
+Seeds a temporary result store with a synthetic cohort, then for every
+sidebar page starts a fresh Python process that opens the app directly on
+that page with streamlit's AppTest. "cold" is the first run in that
+process (app imports, the page's module and its dependencies, first
+render), "warm" a second run in the same process. The heavy libraries a
+page pulled in are listed, and a final row times importing every page
+module up front, as the app did before pages were loaded on demand.
+
+    python benchmarks/bench_startup.py [--students 400] [--repeat 1]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['matplotlib', 'pdfplumber', 'openpyxl', 'fpdf', 'pyarrow', 'scipy']
+
+# Runs in a fresh interpreter per page, reports timings as JSON on the last line
+_PAGE_PROBE = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+at.session_state["page"] = {page!r}
+started = time.perf_counter()
+at.run()
+cold = time.perf_counter() - started
+started = time.perf_counter()
+at.run()
+warm = time.perf_counter() - started
+errors = [e.value for e in at.exception] + [e.value for e in at.error]
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"cold": cold, "warm": warm, "errors": errors, "loaded": loaded}}))
+"""
+
+_EAGER_PROBE = """
+import json, time, importlib
+started = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module("pages." + module)
+print(json.dumps({{"seconds": time.perf_counter() - started}}))
+"""
+
+def app_pages():
+    """The app's PAGES mapping, read from app.py without running its streamlit calls"""
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "PAGES" for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("PAGES not found in app.py")
+
+def run_probe(code, env):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def seed_store(env, students):
+    """Store a synthetic cohort in the temporary database the probes will open"""
+    code = (
+        "import sys; sys.path.insert(0, 'benchmarks')\n"
+        "from synthetic_pdf import generate_records\n"
+        "from pages.storage import store_results\n"
+        f"store_results(generate_records({students}), key='bench-startup', name='synthetic.pdf')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm first-render latency per page")
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=1, help="fresh processes per page (best is reported)")
+    args = parser.parse_args()
+
+    pages = app_pages()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, MPLBACKEND="Agg",
+                   RESULT_DB_PATH=os.path.join(tmp, "results.sqlite3"),
+                   RESULT_CACHE_DIR=os.path.join(tmp, "cache"))
+        seed_store(env, args.students)
+
+        print(f"{'page':24} {'cold s':>8} {'warm s':>8}  heavy modules loaded")
+        ok = True
+        for page in pages:
+            code = _PAGE_PROBE.format(app=os.path.join(ROOT, "app.py"), page=page, heavy=HEAVY_MODULES)
+            runs = [run_probe(code, env) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["cold"])
+            status = ", ".join(best["loaded"]) or "-"
+            if best["errors"]:
+                ok = False
+                status += f"  ERROR: {best['errors'][0][:80]}"
+            print(f"{page:24} {best['cold']:>8.3f} {min(run['warm'] for run in runs):>8.3f}  {status}")
+
+        eager = min(run_probe(_EAGER_PROBE.format(modules=list(pages.values())), env)["seconds"]
+                    for _ in range(args.repeat))
+        print(f"{'import all pages':24} {eager:>8.3f} {'':>8}  (what every cold start paid before lazy loading)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Extraction, report and analytics benchmarks on synthetic result PDFs.
+
+For each cohort size a synthetic PDF is generated, parsed with
+extract_student_data_from_bytes and checked against the generator's
+expected records, then the dataset builder, the Excel report and every
+analytics page function are timed on the result. Peak memory is the rise
+in process RSS high-water mark during each stage (Linux), so run with
+--workers 1 to keep extraction memory in this process. --low-memory parses
+from a memory-mapped temporary file instead of bytes, and --max-extract-mb
+fails the run if extraction memory rises above a ceiling at any size.
+
+    python benchmarks/run_benchmarks.py [--sizes 100 1000 10000] [--subjects 9] [--workers 1]
+    python benchmarks/run_benchmarks.py --low-memory --max-extract-mb 150
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib.pyplot as plt
+from openpyxl import load_workbook
+
+from pages import dashboard, division_analysis, pass_fail_analysis, subject_analysis, top_students
+from pages.excel_report import build_excel_report
+from pages.result_dataset import build_dataset
+from pages.upload_pdf import FIRST_RESULT_PAGE, extract_student_data_from_bytes
+from synthetic_pdf import generate_result_pdf
+
+def _read_kb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def reset_peak_rss():
+    """Reset the kernel's RSS high-water mark for this process (Linux only)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def measure(fn, *args):
+    """Run fn(*args) and return (result, seconds, peak RSS rise in MiB or None)"""
+    reset_peak_rss()
+    rss_before = _read_kb("VmRSS:")
+    started = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - started
+    peak = _read_kb("VmHWM:")
+    peak_mb = (peak - rss_before) / 1024 if peak is not None and rss_before is not None else None
+    plt.close("all")
+    return result, seconds, peak_mb
+
+def report(stage, size, seconds, rate, peak_mb, ok):
+    peak_text = f"{peak_mb:8.1f}" if peak_mb is not None else f"{'n/a':>8}"
+    print(f"{stage:20} {size:>7} {seconds:>9.3f} {rate:>22} {peak_text}  {'ok' if ok else 'MISMATCH'}")
+
+def bench_size(students, args):
+    pdf_bytes, expected = generate_result_pdf(students, args.subjects, args.quirk_rate, args.seed)
+    pages = students + FIRST_RESULT_PAGE
+
+    if args.low_memory:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spooled:
+            spooled.write(pdf_bytes)
+        source = spooled.name
+        del pdf_bytes
+    else:
+        source = pdf_bytes
+
+    try:
+        records, seconds, peak = measure(extract_student_data_from_bytes, source, args.workers)
+    finally:
+        if args.low_memory:
+            os.remove(source)
+    ok = records == expected
+    report("extract", students, seconds, f"{pages / seconds:,.1f} pages/s", peak, ok)
+    if not ok:
+        return False
+    if args.max_extract_mb is not None and peak is not None and peak > args.max_extract_mb:
+        print(f"extract memory {peak:.1f} MB exceeds the {args.max_extract_mb} MB ceiling")
+        return False
+
+    dataset, seconds, peak = measure(build_dataset, records)
+    report("build_dataset", students, seconds, f"{students / seconds:,.0f} students/s", peak,
+           len(dataset) == students and len(dataset.subjects) == args.subjects)
+
+    workbook, seconds, peak = measure(build_excel_report, dataset)
+    # Write-only workbooks carry no dimension record, so count the rows instead of reading max_row
+    rows = sum(1 for _ in load_workbook(workbook, read_only=True).active.iter_rows(values_only=True))
+    report("excel_report", students, seconds, f"{students / seconds:,.0f} rows/s", peak, rows == students + 1)
+
+    analytics = [
+        ("dashboard", dashboard.performance_dashboard, dataset),
+        ("top_students", top_students.find_top_students, dataset),
+        ("division_analysis", division_analysis.division_analysis, dataset),
+        ("pass_fail_analysis", pass_fail_analysis.find_pass_fail, dataset),
+        ("subject_analysis", subject_analysis.subject_analysis, dataset),
+    ]
+    for stage, fn, arg in analytics:
+        _, seconds, peak = measure(fn, arg)
+        report(stage, students, seconds, f"{students / seconds:,.0f} students/s", peak, True)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result PDF extraction, reports and analytics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--subjects", type=int, default=9)
+    parser.add_argument("--quirk-rate", type=float, default=0.1, help="share of marks printed as *, $ + or AB")
+    parser.add_argument("--workers", type=int, default=1, help="extraction processes (0 = all CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--low-memory", action="store_true", help="extract from a memory-mapped temporary file")
+    parser.add_argument("--max-extract-mb", type=float, help="fail if extraction raises peak RSS by more than this")
+    args = parser.parse_args()
+    args.workers = args.workers or None
+
+    # Page functions run outside `streamlit run`, where their UI calls are no-ops that log warnings
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).disabled = True
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    print(f"{'stage':20} {'size':>7} {'seconds':>9} {'throughput':>22} {'peak MB':>8}  output")
+    ok = all([bench_size(students, args) for students in args.sizes])
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
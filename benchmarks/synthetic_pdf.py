@@ -0,0 +1,127 @@
+"""Synthetic university result PDFs for benchmarking the extractor.
+
+Each PDF has the four cover pages the extractor skips, then one page per
+student laid out like the university format, including the mark
+annotations the tokenizer has to fold ("* 12", "$ 14 +2", "AB").
+generate_result_pdf also returns the records the extractor should produce,
+and generate_records builds just those records for report benchmarks.
+Passing revised gives the same PDF as reissued after revaluation.
+"""
+import random
+from fpdf import FPDF
+
+COVER_PAGES = 4
+# UA marks added to a subject revaluated in a reissued PDF
+REVALUATION_MARKS = 3
+SUBJECT_PREFIXES = ['BCA', 'ECS', 'CC', 'ENG', 'ENS', 'SEC']
+FIRST_NAMES = ['AARAV', 'ADITI', 'ANANYA', 'ARJUN', 'DIYA', 'ISHAAN', 'KAVYA', 'MEERA',
+               'NIKHIL', 'PRIYA', 'RAHUL', 'ROHAN', 'SAKSHI', 'SHREYA', 'TANVI', 'VIHAAN']
+LAST_NAMES = ['DESHMUKH', 'GAIKWAD', 'JADHAV', 'KULKARNI', 'MANE', 'PATIL', 'PAWAR',
+              'SALUNKHE', 'SHINDE', 'SURYAWANSHI']
+
+def subject_codes(count):
+    return [f"{SUBJECT_PREFIXES[i % len(SUBJECT_PREFIXES)]}-{301 + i}" for i in range(count)]
+
+def _subject_line(rng, code, quirk_rate, regrace=0):
+    """One marks line plus the tokens the extractor should keep from it (regrace marks added to UA)"""
+    ca = rng.randint(5, 20)
+    ua = rng.randint(10, 60)
+    quirk = rng.random() / max(quirk_rate, 1e-9)
+
+    if quirk < 0.3:
+        # Grace marks are printed with a leading "*" and stay one token
+        ua_text = ua_token = f"* {ua}"
+    elif quirk < 0.6:
+        # "$ 14 +2" is a condoned mark, folded into its sum
+        ua_text, ua = f"$ {ua} +2", ua + 2
+        ua_token = str(ua)
+    elif quirk < 1.0:
+        ua_text = ua_token = "AB"
+        ua = 0
+    else:
+        ua_text = ua_token = str(ua)
+    if regrace and ua_token != "AB":
+        # Revaluation raises a plain UA mark and leaves everything drawn from rng unchanged
+        ua += regrace
+        ua_text = ua_token = str(ua)
+
+    total = ua + ca
+    status = "P" if total >= 40 and ua_token != "AB" else "F"
+    grade = "O" if total >= 80 else "A" if total >= 60 else "B" if total >= 40 else "F"
+    line = f"{code} 4 T {ua_text} 60 {ca} 20 80 {total} {grade} 8 32 {status} 4"
+    expected = {'Code': code, 'UA': ua_token, 'CA': str(ca), 'Total': str(total), 'Status1': status}
+    return line, expected, total
+
+def _student_pages(students, subjects, quirk_rate, seed, revised=()):
+    """(page lines, expected record) for each synthetic student, in PDF order"""
+    rng = random.Random(seed)
+    codes = subject_codes(subjects)
+
+    for seq in range(1, students + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        seat_no = str(100000 + seq)
+        prn_no = f"2021{seq:08d}"
+
+        lines = [
+            "SHIVAJI UNIVERSITY, KOLHAPUR",
+            f"{seq}. {name}",
+            f"Seat No: {seat_no} PRN No. {prn_no} College Code: SANG",
+            "Course Cr Type UA Max CA Max Max Total Grade GP CP Result Earned",
+        ]
+        record = {'Name': name, 'Seat No': seat_no, 'PRN No': prn_no,
+                  'Code': [], 'UA': [], 'CA': [], 'Total': [], 'Status1': []}
+        grand_total = 0
+        for i, code in enumerate(codes):
+            regrace = REVALUATION_MARKS if i == 0 and seq - 1 in revised else 0
+            line, cell, total = _subject_line(rng, code, quirk_rate, regrace)
+            lines.append(line)
+            grand_total += total
+            for field, value in cell.items():
+                record[field].append(value)
+
+        fails = record['Status1'].count("F")
+        record['Status'] = "Pass" if fails == 0 else "ATKT" if fails <= 2 else "Fail"
+        record['Percentage'] = f"{grand_total / len(codes):.2f}"
+        lines.append(f"Status: {record['Status']} Percentage: {record['Percentage']} %")
+        yield lines, record
+
+def generate_records(students, subjects=9, quirk_rate=0.1, seed=0):
+    """The records generate_result_pdf would expect, without rendering the PDF"""
+    return [record for _, record in _student_pages(students, subjects, quirk_rate, seed)]
+
+def generate_result_pdf(students, subjects=9, quirk_rate=0.1, seed=0, revised=()):
+    """Return (pdf_bytes, expected_records) for a result PDF with the given shape.
+
+    revised holds the positions of students whose first subject was
+    revaluated (REVALUATION_MARKS more in UA); every other page is
+    byte-for-byte the page generated without it.
+    """
+    pdf = FPDF()
+    pdf.set_auto_page_break(False)
+    pdf.set_font("Courier", size=8)
+
+    for page in range(COVER_PAGES):
+        pdf.add_page()
+        pdf.cell(0, 5, f"SHIVAJI UNIVERSITY, KOLHAPUR - RESULT REGISTER ({page + 1})", 0, 1)
+
+    expected_records = []
+    for lines, record in _student_pages(students, subjects, quirk_rate, seed, set(revised)):
+        pdf.add_page()
+        for line in lines:
+            pdf.cell(0, 5, line, 0, 1)
+        expected_records.append(record)
+
+    return pdf.output(dest='S').encode('latin1'), expected_records
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Write a synthetic result PDF")
+    parser.add_argument("output")
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--subjects", type=int, default=9)
+    parser.add_argument("--quirk-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    pdf_bytes, _ = generate_result_pdf(args.students, args.subjects, args.quirk_rate, args.seed)
+    with open(args.output, "wb") as f:
+        f.write(pdf_bytes)
@@ -0,0 +1,129 @@
+"""Batch ingest of university result PDFs without the web app.
+
+Parses every PDF in a directory concurrently, stores each result in the
+parse cache and the shared SQLite store (so the app opens it instantly
+instead of parsing inside a web request), and prints per-file throughput.
+Pages already parsed for an earlier upload (a PDF reissued after
+revaluation) are reused, and the students whose results changed are listed.
+
+    python ingest.py results/2024-oct [--recursive] [--jobs 8] [--force]
+    RESULT_INSTRUMENTATION=1 python ingest.py results/2024-oct --metrics-json metrics.json
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pages import instrumentation, parse_cache
+from pages.result_dataset import short_data
+from pages.comparison import mark_changes
+from pages.storage import load_dataset, parsed_pages, previous_version, store_results
+from pages.upload_pdf import PARSER_VERSION, add_page_records, iter_page_records
+
+def find_pdfs(directory, recursive=False):
+    pdfs = []
+    for root, dirs, files in os.walk(directory):
+        pdfs.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+        if not recursive:
+            break
+    return sorted(pdfs)
+
+def parse_file(path, page_workers=1, force=False):
+    """Parse one PDF (or reuse its cached parse); runs inside a pool worker"""
+    started = time.perf_counter()
+    key = parse_cache.file_cache_key(path, PARSER_VERSION)
+
+    cached = None if force else parse_cache.get(key)
+    known_pages = {}
+    if cached is not None:
+        student_info, pages, total_pages = cached['Result_dict'], cached.get('Pages'), None
+    else:
+        student_info, pages, total_pages = [], [], 0
+        def reuse(hashes):
+            known_pages.update(parsed_pages(hashes))
+            return known_pages
+        with instrumentation.timed("ingest_file", profile=True):
+            # Parsed straight from the file through mmap, so big PDFs never sit in memory whole
+            for _, total_pages, page_records in iter_page_records(path, workers=page_workers,
+                                                                  reuse=None if force else reuse):
+                add_page_records(page_records, student_info, pages)
+        if student_info:
+            parse_cache.put(key, {'Result_dict': student_info, 'Shoert_data': short_data(student_info),
+                                  'Pages': pages})
+
+    reused_pages = sum(content_hash in known_pages for _, content_hash, _ in pages or ())
+    # Timings and counters recorded in this worker process go back to the parent with the result
+    return (key, student_info, pages, total_pages, reused_pages,
+            time.perf_counter() - started, instrumentation.drain())
+
+def revision_report(upload_id):
+    """One line per student whose result changed since the upload this one revises, or [] if none"""
+    base_id = previous_version(upload_id)
+    if base_id is None:
+        return []
+    changes = mark_changes(load_dataset(base_id), load_dataset(upload_id))
+    return [f"    {row['Seat No']} {row['Name']}: {row['Change']} {row['Details']}".rstrip()
+            for _, row in changes.iterrows()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a directory of result PDFs into the shared result store.")
+    parser.add_argument("directory")
+    parser.add_argument("-r", "--recursive", action="store_true", help="also process PDFs in subdirectories")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="files parsed at the same time")
+    parser.add_argument("--force", action="store_true", help="re-parse files that are already cached")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="write stage timings and counters here (needs RESULT_INSTRUMENTATION=1)")
+    args = parser.parse_args(argv)
+
+    pdfs = find_pdfs(args.directory, args.recursive)
+    if not pdfs:
+        print(f"No PDF files found in {args.directory}", file=sys.stderr)
+        return 1
+
+    # One file at a time gets the whole page-level process pool; many files are spread one per worker
+    jobs = max(1, min(args.jobs, len(pdfs)))
+    page_workers = args.jobs if jobs == 1 else 1
+
+    print(f"{'file':40} {'pages':>6} {'students':>9} {'seconds':>8} {'pages/s':>8}  upload")
+    failures = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=instrumentation.reset) as pool:
+        futures = {pool.submit(parse_file, path, page_workers, args.force): path for path in pdfs}
+        for future in as_completed(futures):
+            path = futures[future]
+            name = os.path.relpath(path, args.directory)
+            try:
+                key, student_info, pages, total_pages, reused_pages, seconds, metrics = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"{name:40} failed: {e}")
+                continue
+
+            instrumentation.merge(metrics)
+            if not student_info:
+                failures += 1
+                print(f"{name:40} no student data found")
+                continue
+
+            # SQLite writes stay in this process so there is a single writer
+            upload_id = store_results(student_info, key=key, name=os.path.basename(path), pages=pages)
+            if total_pages is None:
+                print(f"{name:40} {'cached':>6} {len(student_info):>9} {seconds:>8.2f} {'-':>8}  #{upload_id}")
+            else:
+                print(f"{name:40} {total_pages:>6} {len(student_info):>9} {seconds:>8.2f} "
+                      f"{total_pages / max(seconds, 1e-6):>8.1f}  #{upload_id}")
+            if reused_pages:
+                changes = revision_report(upload_id)
+                print(f"    {reused_pages}/{total_pages} pages reused, {len(changes)} student(s) changed")
+                for line in changes:
+                    print(line)
+
+    print(f"{len(pdfs) - failures}/{len(pdfs)} files ingested in {time.perf_counter() - started:.1f}s")
+    if args.metrics_json:
+        with open(args.metrics_json, "w", encoding="utf-8") as f:
+            f.write(instrumentation.to_json())
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import streamlit as st
+import pandas as pd
+from pages import instrumentation
+
+def instrumentation_panel():
+    st.header("🛠️ Instrumentation")
+
+    if not instrumentation.ENABLED:
+        st.info("Instrumentation is off. Start the app with RESULT_INSTRUMENTATION=1 "
+                "(or =profile to also capture cProfile reports) to record timings.")
+        return
+
+    snapshot = instrumentation.snapshot()
+    st.caption(f"Process {snapshot['pid']} · recording since {snapshot['since']} · "
+               f"cProfile {'on' if snapshot['profiling'] else 'off'}")
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        label="📥 Download metrics JSON",
+        data=instrumentation.to_json(),
+        file_name="result_manager_metrics.json",
+        mime="application/json"
+    )
+    if col2.button("Reset metrics"):
+        instrumentation.reset()
+        st.rerun()
+
+    st.subheader("Stage Timings")
+    if snapshot['stages']:
+        stages = pd.DataFrame([
+            {
+                "Stage": stage,
+                "Calls": stats['count'],
+                "Total (s)": round(stats['total_s'], 3),
+                "Mean (ms)": round(stats['mean_s'] * 1000, 2),
+                "Max (ms)": round(stats['max_s'] * 1000, 2),
+            }
+            for stage, stats in snapshot['stages'].items()
+        ]).sort_values("Total (s)", ascending=False)
+        st.dataframe(stages, hide_index=True)
+    else:
+        st.write("No stages recorded yet - open a page or upload a PDF.")
+
+    st.subheader("Counters")
+    if snapshot['counters']:
+        st.dataframe(pd.DataFrame(sorted(snapshot['counters'].items()), columns=["Counter", "Value"]),
+                     hide_index=True)
+    else:
+        st.write("No counters recorded yet.")
+
+    if snapshot['profiles']:
+        st.subheader("cProfile (latest run of each stage)")
+        for stage, report in sorted(snapshot['profiles'].items()):
+            with st.expander(stage):
+                st.code(report)
+
+def show():
+    instrumentation_panel()
@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+import matplotlib.pyplot as plt
+import streamlit as st
+from pages import instrumentation
+
+# Rendered charts are small PNGs; this bounds the server-wide cache to a few MB
+MAX_CACHED_CHARTS = 128
+# Same output settings st.pyplot uses, so cached charts look as they did before
+SAVEFIG_OPTIONS = {'format': 'png', 'dpi': 200, 'bbox_inches': 'tight'}
+
+_lock = threading.Lock()
+_rendered = OrderedDict()
+
+def render_png(fig):
+    """PNG bytes of a figure; the figure is closed afterwards so pyplot does not keep it alive"""
+    try:
+        buffer = BytesIO()
+        fig.savefig(buffer, **SAVEFIG_OPTIONS)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+def chart_png(dataset, chart, params, draw):
+    """Rendered chart for (dataset, chart, params), drawing it with draw() only on a cache miss.
+
+    draw must return a new matplotlib figure built only from the dataset
+    and params, since the cached image is shared across sessions.
+    """
+    key = (dataset.fingerprint, chart, params)
+    with _lock:
+        png = _rendered.get(key)
+        if png is not None:
+            _rendered.move_to_end(key)
+            instrumentation.count("chart_cache_hits")
+            return png
+
+    with instrumentation.timed(f"chart:{chart}"):
+        png = render_png(draw())
+    with _lock:
+        _rendered[key] = png
+        _rendered.move_to_end(key)
+        while len(_rendered) > MAX_CACHED_CHARTS:
+            _rendered.popitem(last=False)
+    return png
+
+def show_chart(dataset, chart, params, draw):
+    """Display a cached chart in place of st.pyplot"""
+    st.image(chart_png(dataset, chart, params, draw), width="stretch")
@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+from pages.comparison import JOIN_KEYS, percentage_history, progression, student_deltas, subject_trends
+from pages.charts import show_chart
+from pages.exports import export_button
+from pages.storage import list_uploads, load_dataset
+
+def upload_labels(uploads):
+    """Display label of every stored upload, oldest first, mapped to its id"""
+    return {f"{name or 'Untitled'} · {n_students} students · {created_at}": upload_id
+            for upload_id, name, created_at, n_students in sorted(uploads)}
+
+def compare_datasets():
+    st.header("🔁 Compare Datasets")
+
+    uploads = list_uploads()
+    if len(uploads) < 2:
+        st.warning("Comparisons need at least two processed PDFs. Upload another result PDF first.")
+        return
+
+    labels = upload_labels(uploads)
+    chosen = st.multiselect(
+        "Datasets to compare (earliest first)",
+        list(labels),
+        default=list(labels)[-2:],
+        key="compare_uploads"
+    )
+    on = st.radio("Match students on", JOIN_KEYS, horizontal=True, key="compare_on")
+    if len(chosen) < 2:
+        st.info("Select at least two datasets")
+        return
+
+    datasets = [load_dataset(labels[label]) for label in chosen]
+    before, after = datasets[0], datasets[-1]
+    deltas = student_deltas(before, after, on)
+    matched = deltas[deltas['Presence'] == 'Both']
+    params = (before.fingerprint, on)
+
+    st.caption(f"Changes are from **{chosen[0]}** to **{chosen[-1]}**")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Matched Students", len(matched))
+    col2.metric("Joined", int((deltas['Presence'] == 'Joined').sum()))
+    col3.metric("Left", int((deltas['Presence'] == 'Left').sum()))
+    mean_change = matched['Change'].mean()
+    col4.metric("Mean Percentage Change", "-" if pd.isna(mean_change) else f"{mean_change:+.2f}")
+
+    if matched.empty:
+        st.warning(f"No students share a {on} in these datasets. Try matching on the other column.")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Students", "Progression", "Subjects", "History"])
+
+    with tab1:
+        presence = st.selectbox("Show", ["Both", "Joined", "Left"], key="compare_presence")
+        rows = deltas[deltas['Presence'] == presence].drop(columns=['Presence', 'Row Before', 'Row After'])
+        if presence == 'Both':
+            rows = rows.sort_values('Change', ascending=False, kind='stable')
+        st.dataframe(rows.rename(columns={'Key': on}).round(2), hide_index=True)
+        export_button(
+            after,
+            label="📥 Download Student Changes (CSV)",
+            export="comparison_csv",
+            params=params,
+            build=lambda: deltas.drop(columns=['Row Before', 'Row After']).rename(columns={'Key': on})
+                .to_csv(index=False).encode('utf-8'),
+            file_name="student_changes.csv",
+            mime="text/csv",
+            key="comparison_csv_download"
+        )
+
+        if not matched.empty:
+            def draw():
+                fig, ax = plt.subplots(figsize=(10, 4))
+                ax.hist(matched['Change'].dropna(), bins=30, color='#2196F3', edgecolor='white')
+                ax.axvline(0, color='black', linewidth=1)
+                ax.set_xlabel('Percentage Change')
+                ax.set_ylabel('Number of Students')
+                ax.set_title('Change in Percentage of Matched Students')
+                return fig
+            show_chart(after, "comparison_change", params, draw)
+
+    with tab2:
+        column = st.radio("Progression of", ["Status", "Division"], horizontal=True, key="compare_progression")
+        st.dataframe(progression(deltas, column))
+        st.caption("Rows are the earlier dataset, columns the later one; only matched students are counted.")
+
+    with tab3:
+        trends = subject_trends(before, after, deltas)
+        st.dataframe(trends.round(2), hide_index=True)
+        common = trends.dropna(subset=['Mean Before', 'Mean After'])
+        if not common.empty:
+            def draw():
+                fig, ax = plt.subplots(figsize=(10, 5))
+                positions = range(len(common))
+                ax.bar([p - 0.2 for p in positions], common['Mean Before'], width=0.4, label=chosen[0][:30])
+                ax.bar([p + 0.2 for p in positions], common['Mean After'], width=0.4, label=chosen[-1][:30])
+                ax.set_xticks(list(positions))
+                ax.set_xticklabels(common['Subject'], rotation=45, ha='right')
+                ax.set_ylabel('Mean Total')
+                ax.set_title('Subject Means')
+                ax.legend()
+                plt.tight_layout()
+                return fig
+            show_chart(after, "comparison_subjects", params + (chosen[0], chosen[-1]), draw)
+        else:
+            st.info("The datasets have no subjects in common")
+
+    with tab4:
+        history = percentage_history(datasets, chosen, on)
+        st.dataframe(history.round(2), hide_index=True)
+        st.caption(f"Percentage per dataset, one row per {on}; blank where the student is not in a dataset.")
+
+def show():
+    compare_datasets()
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from pages.percentage_index import DIVISION_ORDER
+from pages.result_dataset import MISSING, STATUS_ORDER, subject_code
+
+# Student columns two datasets can be joined on, preferred first: the PRN stays with a
+# student across semesters, the Seat No only within one exam
+JOIN_KEYS = ['PRN No', 'Seat No']
+# Presence of a student in a comparison: in both datasets, only the earlier or only the later one
+PRESENCE = {'both': 'Both', 'left_only': 'Left', 'right_only': 'Joined'}
+# Printed per-subject fields compared between two versions of a result, with their display names
+CHANGE_FIELDS = {'UA': 'UA', 'CA': 'CA', 'Total': 'Total', 'Status1': 'Result'}
+
+def student_keys(dataset, on):
+    """Normalized join key of every student (trimmed, upper case), NaN where it is blank"""
+    keys = dataset.students[on].fillna('').astype(str).str.strip().str.upper()
+    return keys.where(keys != '')
+
+def student_frame(dataset, on):
+    """One row per distinct join key with the summary columns compared; repeated keys keep their first row"""
+    summary = dataset.summary
+    frame = pd.DataFrame({
+        'Key': student_keys(dataset, on),
+        'Row': np.arange(len(dataset)),
+        'Name': summary['Name'],
+        'Percentage': summary['Percentage'],
+        'Rank': summary['Rank'],
+        'Status': summary['Status'].astype(object),
+        'Division': dataset.percentage_index.divisions.astype(object),
+    })
+    return frame.dropna(subset=['Key']).drop_duplicates('Key')
+
+def student_deltas(before, after, on='PRN No'):
+    """Students of two datasets matched on a key column in one hash join, with their changes.
+
+    One row per key found in either dataset. Presence says whether the
+    student is in both, Left (only before) or Joined (only after). Change is
+    the percentage difference and Rank Change the places gained (positive
+    when the student moved up).
+    """
+    joined = student_frame(before, on).merge(
+        student_frame(after, on), on='Key', how='outer', suffixes=(' Before', ' After'), indicator='Presence'
+    )
+    joined['Presence'] = joined['Presence'].astype(str).map(PRESENCE)
+    joined['Name'] = joined['Name After'].fillna(joined['Name Before'])
+    joined['Change'] = joined['Percentage After'] - joined['Percentage Before']
+    joined['Rank Change'] = joined['Rank Before'] - joined['Rank After']
+    for column in ('Row Before', 'Row After'):
+        joined[column] = joined[column].astype('Int64')
+    return joined[[
+        'Key', 'Name', 'Presence',
+        'Percentage Before', 'Percentage After', 'Change',
+        'Rank Before', 'Rank After', 'Rank Change',
+        'Status Before', 'Status After', 'Division Before', 'Division After',
+        'Row Before', 'Row After',
+    ]]
+
+def progression(deltas, column='Status'):
+    """Crosstab of matched students' Status or Division before (rows) and after (columns)"""
+    order = STATUS_ORDER if column == 'Status' else DIVISION_ORDER
+    matched = deltas[deltas['Presence'] == 'Both']
+    table = pd.crosstab(matched[f'{column} Before'], matched[f'{column} After'])
+    # Statuses outside the usual ones (if any) go after them, in name order
+    labels = order + sorted((set(table.index) | set(table.columns)) - set(order))
+    return table.reindex(index=labels, columns=labels, fill_value=0).rename_axis(
+        index=f'{column} Before', columns=f'{column} After'
+    )
+
+def _totals(dataset, subjects, rows):
+    """float32 (rows x subjects) Total marks, NaN where a student has no numeric mark"""
+    cols = [dataset.subject_index(subject) for subject in subjects]
+    total = dataset.marks['Total'][np.ix_(rows, cols)]
+    taken = dataset.taken[np.ix_(rows, cols)]
+    return np.where(taken & (total != MISSING), total, np.nan).astype(np.float32)
+
+def subject_trends(before, after, deltas):
+    """Per-subject statistics of both datasets side by side, one row per subject in either.
+
+    Mean Change and Pass Rate Change compare the whole cohorts; Matched
+    Change is the mean change in Total of the students present in both
+    datasets who have a mark for the subject in each.
+    """
+    columns = ['Subject', 'Students', 'Mean', 'Pass Rate']
+    trends = before.subject_stats[columns].merge(
+        after.subject_stats[columns], on='Subject', how='outer', suffixes=(' Before', ' After'), sort=False
+    )
+    trends['Mean Change'] = trends['Mean After'] - trends['Mean Before']
+    trends['Pass Rate Change'] = trends['Pass Rate After'] - trends['Pass Rate Before']
+
+    common = [subject for subject in after.subjects if subject in set(before.subjects)]
+    matched = deltas[deltas['Presence'] == 'Both']
+    trends['Matched Change'] = np.nan
+    trends['Matched Students'] = 0
+    if common and len(matched):
+        # Both mark matrices gathered in matched-student order, then every subject differenced at once
+        change = (_totals(after, common, matched['Row After'].to_numpy(dtype=np.intp))
+                  - _totals(before, common, matched['Row Before'].to_numpy(dtype=np.intp)))
+        # The "#2" columns of a repeated code count with the first, as subject_stats does
+        codes = [subject_code(subject) for subject in common]
+        counted = pd.Series((~np.isnan(change)).sum(axis=0), index=codes).groupby(level=0, sort=False).sum()
+        change_sum = pd.Series(np.nansum(change, axis=0), index=codes).groupby(level=0, sort=False).sum()
+        position = trends.set_index('Subject').index.get_indexer(counted.index)
+        trends.loc[position, 'Matched Change'] = (change_sum / counted.where(counted > 0)).to_numpy()
+        trends.loc[position, 'Matched Students'] = counted.to_numpy()
+    return trends
+
+def percentage_history(datasets, names, on='PRN No'):
+    """Percentage of every student across several datasets, one column per dataset name.
+
+    Students are aligned on the join key (a hash join per dataset); a
+    student missing from a dataset has NaN in its column. Name is taken
+    from the latest dataset the student appears in.
+    """
+    frames = [student_frame(dataset, on).set_index('Key') for dataset in datasets]
+    history = pd.concat([frame['Percentage'].rename(name) for frame, name in zip(frames, names)], axis=1)
+    name = pd.Series(index=history.index, dtype=object)
+    for frame in frames:
+        name.update(frame['Name'])
+    history.insert(0, 'Name', name)
+    return history.rename_axis(on).reset_index()
+
+def mark_changes(before, after, on='Seat No'):
+    """Students whose printed result differs between two versions of the same result PDF.
+
+    Matched students are compared on every subject's UA/CA/Total/result
+    tokens plus their percentage and status, all students and subjects at
+    once; Details lists each difference as "BCA-301 Total 38 → 41".
+    Students in only one version are listed as Added or Removed.
+    """
+    deltas = student_deltas(before, after, on)
+    matched = deltas[deltas['Presence'] == 'Both']
+    rows_before = matched['Row Before'].to_numpy(dtype=np.intp)
+    rows_after = matched['Row After'].to_numpy(dtype=np.intp)
+    details = [[] for _ in range(len(matched))]
+
+    for field in ('Percentage', 'Status'):
+        old = before.students[field].to_numpy(dtype=object)[rows_before].astype(str)
+        new = after.students[field].to_numpy(dtype=object)[rows_after].astype(str)
+        for i in np.flatnonzero(old != new):
+            details[i].append(f"{field} {old[i]} → {new[i]}")
+
+    before_subjects = set(before.subjects)
+    common = [subject for subject in after.subjects if subject in before_subjects]
+    if common:
+        cols_before = [before.subject_index(subject) for subject in common]
+        cols_after = [after.subject_index(subject) for subject in common]
+        old = np.stack([before.tokens[field][np.ix_(rows_before, cols_before)] for field in CHANGE_FIELDS], axis=-1)
+        new = np.stack([after.tokens[field][np.ix_(rows_after, cols_after)] for field in CHANGE_FIELDS], axis=-1)
+        labels = list(CHANGE_FIELDS.values())
+        # nonzero walks student, then subject, then field, so each student's details read in column order
+        for i, j, k in zip(*np.nonzero(old != new)):
+            details[i].append(f"{subject_code(common[j])} {labels[k]} {old[i, j, k] or '-'} → {new[i, j, k] or '-'}")
+
+    changed = matched.assign(Change='Revised', Details=['; '.join(items) for items in details])
+    changed = changed[changed['Details'] != '']
+    moved = deltas[deltas['Presence'] != 'Both'].assign(Details='')
+    moved = moved.assign(Change=moved['Presence'].map({'Joined': 'Added', 'Left': 'Removed'}))
+    columns = ['Key', 'Name', 'Change', 'Percentage Before', 'Percentage After', 'Details']
+    return pd.concat([changed[columns], moved[columns]], ignore_index=True).rename(columns={'Key': on})
@@ -1,27 +1,25 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
-from scipy.stats import gaussian_kde
+from pages.charts import show_chart
+from pages.density import percentage_density
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
+# Green, Amber, Red - also used for the per-status density curves
+STATUS_COLORS = {'Pass': '#4CAF50', 'ATKT': '#FFC107', 'Fail': '#F44336'}
 
-def performance_dashboard(data):
+def performance_dashboard(dataset):
     st.header("📈 Performance Dashboard")
     
-    if not data:
+    if not dataset:
         st.warning("No data available. Please upload and process a PDF first.")
         return
     
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
-    df['Percentage'] = df['Percentage'].astype(float)
+    # Typed summary shared with the other pages (float32 percentage, categorical status)
+    df = dataset.summary
     
     # Calculate statistics
     avg_percentage = df['Percentage'].mean()
-    pass_rate = (len(df[df['Status'] == 'Pass']) / len(df)) * 100
+    pass_rate = df['Passed'].mean() * 100
     
     # Display KPIs
     col1, col2, col3 = st.columns(3)
@@ -33,39 +31,57 @@ def performance_dashboard(data):
     tab1, tab2 = st.tabs(["Percentage Distribution", "Status Overview"])
     
     with tab1:
+        col1, col2 = st.columns(2)
+        bandwidth = col1.select_slider(
+            "Density bandwidth (percentage points)",
+            options=["Auto", 0.5, 1.0, 2.0, 3.0, 5.0],
+            value="Auto",
+            key="kde_bandwidth"
+        )
+        bandwidth = None if bandwidth == "Auto" else float(bandwidth)
+        by_status = col2.checkbox("Overlay density per status", key="kde_by_status")
+        
         # Histogram with KDE
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.hist(df['Percentage'], bins=15, color='skyblue', edgecolor='black', density=True, alpha=0.7)
+        def draw():
+            fig, ax = plt.subplots(figsize=(8, 4))
+            ax.hist(df['Percentage'], bins=15, color='skyblue', edgecolor='black', density=True, alpha=0.7)
         
-        # Add KDE
-        kde = gaussian_kde(df['Percentage'])
-        x = np.linspace(df['Percentage'].min(), df['Percentage'].max(), 200)
-        ax.plot(x, kde(x), color='darkblue', linewidth=2)
+            # Add KDE (binned and cached per dataset and bandwidth)
+            x, curves = percentage_density(dataset, bandwidth, by_status)
+            for name, density in curves.items():
+                ax.plot(x, density, color=STATUS_COLORS.get(name, 'darkblue'), linewidth=2,
+                        label=name if by_status else None)
+            if by_status:
+                ax.legend()
         
-        ax.set_xlabel('Percentage')
-        ax.set_ylabel('Density')
-        ax.set_title('Percentage Distribution with Density Curve')
-        ax.grid(axis='y', alpha=0.75)
-        st.pyplot(fig)
+            ax.set_xlabel('Percentage')
+            ax.set_ylabel('Density')
+            ax.set_title('Percentage Distribution with Density Curve')
+            ax.grid(axis='y', alpha=0.75)
+            return fig
+        show_chart(dataset, "percentage_distribution", (bandwidth, by_status), draw)
     
     with tab2:
         # Status distribution
         status_counts = df['Status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
         
-        fig, ax = plt.subplots(figsize=(6, 6))
-        colors = ['#4CAF50', '#FFC107', '#F44336']  # Green, Amber, Red
-        ax.pie(
-            status_counts,
-            labels=status_counts.index,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors[:len(status_counts)],
-            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-            textprops={'fontsize': 10}
-        )
-        ax.set_title('Student Status Distribution', pad=20)
-        st.pyplot(fig)
+        def draw():
+            fig, ax = plt.subplots(figsize=(6, 6))
+            colors = ['#4CAF50', '#FFC107', '#F44336']  # Green, Amber, Red
+            ax.pie(
+                status_counts,
+                labels=status_counts.index,
+                autopct='%1.1f%%',
+                startangle=90,
+                colors=colors[:len(status_counts)],
+                wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+                textprops={'fontsize': 10}
+            )
+            ax.set_title('Student Status Distribution', pad=20)
+            return fig
+        show_chart(dataset, "status_overview", (), draw)
 
 def show():
-    data = load_data("Shoert_data")
-    performance_dashboard(data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    performance_dashboard(dataset)
\ No newline at end of file
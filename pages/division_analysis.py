@@ -3,10 +3,11 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from fpdf import FPDF
 from io import BytesIO
-
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
+from pages.percentage_index import DIVISION_BANDS, DIVISION_ORDER
+from pages.result_dataset import summary_rows
+from pages.charts import show_chart
+from pages.exports import export_button
+from pages.storage import load_data
 
 def create_division_pdf(div_list, div_name, min_pct, max_pct):
     pdf = FPDF()
@@ -25,38 +26,76 @@ def create_division_pdf(div_list, div_name, min_pct, max_pct):
     pdf.cell(30, 10, "Status", 1, 1, 'C', 1)
     
     pdf.set_fill_color(255, 255, 255)
-    for idx, student in enumerate(div_list, 1):
+    for idx, (seat_no, name, percentage, status) in enumerate(
+            div_list[['Seat No', 'Name', 'Percentage', 'Status']].itertuples(index=False), 1):
         pdf.cell(15, 10, str(idx), 1, 0, 'C')
-        pdf.cell(30, 10, student['Seat No'], 1, 0, 'C')
-        pdf.cell(80, 10, student['Name'][:35], 1, 0, 'L')
-        pdf.cell(30, 10, student['Percentage'], 1, 0, 'C')
-        pdf.cell(30, 10, student['Status'], 1, 1, 'C')
+        pdf.cell(30, 10, seat_no, 1, 0, 'C')
+        pdf.cell(80, 10, name[:35], 1, 0, 'L')
+        pdf.cell(30, 10, f"{percentage:.2f}", 1, 0, 'C')
+        pdf.cell(30, 10, str(status), 1, 1, 'C')
     
     pdf_bytes = BytesIO()
     pdf_bytes.write(pdf.output(dest='S').encode('latin1'))
     pdf_bytes.seek(0)
     return pdf_bytes
 
-def division_analysis(data):
+def division_breakdown(dataset):
+    """Student count and list for every division band, assigned in one pass over the dataset"""
+    summary = dataset.summary
+    divisions = dataset.percentage_index.divisions
+    counts = pd.Series(divisions).value_counts(sort=False).reindex(DIVISION_ORDER, fill_value=0)
+    
+    breakdown = pd.DataFrame({
+        'Division': counts.index,
+        'Students': counts.to_numpy(),
+        'Share': (counts.to_numpy() / max(len(summary), 1) * 100).round(2)
+    })
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.dataframe(breakdown, hide_index=True)
+        st.caption(" · ".join(f"{name}: {bound:g}%+" for name, bound in DIVISION_BANDS))
+    
+    with col2:
+        def draw():
+            fig, ax = plt.subplots(figsize=(8, 4))
+            bars = ax.bar(breakdown['Division'], breakdown['Students'],
+                          color=plt.colormaps['Pastel1'].colors[:len(breakdown)])
+            ax.set_ylabel('Number of Students')
+            ax.set_title('Students per Division')
+            ax.bar_label(bars, padding=3)
+            return fig
+        show_chart(dataset, "division_breakdown", (), draw)
+    
+    division = st.selectbox("View students in division", DIVISION_ORDER, key="division_select")
+    st.dataframe(summary_rows(summary[divisions == division].sort_values('Name', kind='stable')))
+
+def division_analysis(dataset):
     st.header("📊 Custom Division Analysis")
     
-    if not data:
+    if not dataset:
         st.warning("No data available. Please upload and process a PDF first.")
         return
     
+    summary = dataset.summary
+    index = dataset.percentage_index
+    
     # Calculate max percentage in the dataset
-    max_percentage = max(float(d["Percentage"]) for d in data) if data else 100
+    max_percentage = index.max() or 100.0
     
     # Display student count statistics before analysis
     st.subheader("Overall Statistics")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Students", len(data))
+    col1.metric("Total Students", len(summary))
     col2.metric("Highest Percentage", f"{max_percentage:.2f}%")
     
     # Get count of failed students
-    failed_count = len([d for d in data if d["Status"] in ["ATKT", "Fail"]])
+    failed_count = int(summary['Failed'].sum())
     col3.metric("Failed Students", failed_count)
     
+    with st.expander("📋 Full Division Breakdown"):
+        division_breakdown(dataset)
+    
     # Custom range selector
     st.subheader("Set Analysis Criteria")
     col1, col2 = st.columns(2)
@@ -80,17 +119,16 @@ def division_analysis(data):
     )
     
     if st.button("Analyze Division"):
-        div_list = [d for d in data 
-                   if min_pct <= float(d["Percentage"]) <= max_pct
-                   and d["Status"] in status_filter]
-        
-        div_list.sort(key=lambda x: x["Name"])
+        # Two binary searches on the sorted percentages, then the matching rows in name order
+        div_list = summary.iloc[index.range(min_pct, max_pct, status_filter)]
         
         st.subheader(f"Students between {min_pct}% and {max_pct}%")
         st.write(f"Found {len(div_list)} students matching criteria")
         
-        if div_list:
-            df = pd.DataFrame(div_list)
+        if not div_list.empty:
+            df = summary_rows(div_list)
+            # Charts and downloads depend only on the dataset and these criteria, so they are cached on them
+            criteria = (min_pct, max_pct, tuple(status_filter))
             
             tab1, tab2, tab3 = st.tabs(["Data", "Visualizations", "Download"])
             
@@ -104,20 +142,22 @@ def division_analysis(data):
                 with col1:
                     # Status distribution pie chart with consistent size
                     status_counts = df['Status'].value_counts()
-                    fig1, ax1 = plt.subplots(figsize=(6, 6))
-                    colors = plt.colormaps['Pastel1'].colors[:len(status_counts)]
-                    ax1.pie(
-                        status_counts,
-                        labels=status_counts.index,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        colors=colors,
-                        wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-                        textprops={'fontsize': 10}
-                    )
-                    ax1.set_title('Status Distribution', pad=20)
-                    ax1.axis('equal')
-                    st.pyplot(fig1)
+                    def draw():
+                        fig1, ax1 = plt.subplots(figsize=(6, 6))
+                        colors = plt.colormaps['Pastel1'].colors[:len(status_counts)]
+                        ax1.pie(
+                            status_counts,
+                            labels=status_counts.index,
+                            autopct='%1.1f%%',
+                            startangle=90,
+                            colors=colors,
+                            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+                            textprops={'fontsize': 10}
+                        )
+                        ax1.set_title('Status Distribution', pad=20)
+                        ax1.axis('equal')
+                        return fig1
+                    show_chart(dataset, "division_status", criteria, draw)
                 
                 with col2:
                     # Percentage distribution pie chart with consistent size
@@ -131,47 +171,55 @@ def division_analysis(data):
                     )
                     pct_counts = df['Percentage Group'].value_counts()
                     
-                    fig2, ax2 = plt.subplots(figsize=(6, 6))
-                    colors = plt.colormaps['Pastel2'].colors[:len(pct_counts)]
-                    ax2.pie(
-                        pct_counts,
-                        labels=pct_counts.index,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        colors=colors,
-                        wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-                        textprops={'fontsize': 10}
-                    )
-                    ax2.set_title('Percentage Distribution', pad=20)
-                    ax2.axis('equal')
-                    st.pyplot(fig2)
+                    def draw():
+                        fig2, ax2 = plt.subplots(figsize=(6, 6))
+                        colors = plt.colormaps['Pastel2'].colors[:len(pct_counts)]
+                        ax2.pie(
+                            pct_counts,
+                            labels=pct_counts.index,
+                            autopct='%1.1f%%',
+                            startangle=90,
+                            colors=colors,
+                            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+                            textprops={'fontsize': 10}
+                        )
+                        ax2.set_title('Percentage Distribution', pad=20)
+                        ax2.axis('equal')
+                        return fig2
+                    show_chart(dataset, "division_percentage_groups", criteria, draw)
                 
                 # Add histogram for percentage distribution
                 st.subheader("Percentage Distribution Histogram")
-                fig3, ax3 = plt.subplots(figsize=(8, 4))
-                ax3.hist(df['Percentage'].astype(float), bins=15, color='skyblue', edgecolor='black')
-                ax3.set_xlabel('Percentage')
-                ax3.set_ylabel('Number of Students')
-                ax3.set_title('Percentage Distribution')
-                ax3.grid(axis='y', alpha=0.75)
-                st.pyplot(fig3)
+                def draw():
+                    fig3, ax3 = plt.subplots(figsize=(8, 4))
+                    ax3.hist(df['Percentage'].astype(float), bins=15, color='skyblue', edgecolor='black')
+                    ax3.set_xlabel('Percentage')
+                    ax3.set_ylabel('Number of Students')
+                    ax3.set_title('Percentage Distribution')
+                    ax3.grid(axis='y', alpha=0.75)
+                    return fig3
+                show_chart(dataset, "division_histogram", criteria, draw)
             
             with tab3:
                 st.markdown("### Download Options")
-                pdf_bytes = create_division_pdf(div_list, f"{min_pct}-{max_pct}", min_pct, max_pct)
-                
-                st.download_button(
+                # Files are generated only when a button is clicked, then reused from the export cache
+                export_button(
+                    dataset,
                     label="📄 Download as PDF",
-                    data=pdf_bytes,
+                    export="division_pdf",
+                    params=criteria,
+                    build=lambda: create_division_pdf(div_list, f"{min_pct}-{max_pct}", min_pct, max_pct).getvalue(),
                     file_name=f"Division_{min_pct}_{max_pct}_Students.pdf",
                     mime="application/pdf",
                     key="pdf_download"
                 )
                 
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
+                export_button(
+                    dataset,
                     label="📊 Download as CSV",
-                    data=csv,
+                    export="division_csv",
+                    params=criteria,
+                    build=lambda: df.to_csv(index=False).encode('utf-8'),
                     file_name=f"Division_{min_pct}_{max_pct}_Students.csv",
                     mime="text/csv",
                     key="csv_download"
@@ -180,5 +228,5 @@ def division_analysis(data):
             st.info("No students found matching the criteria")
 
 def show():
-    data = load_data("Shoert_data")
-    division_analysis(data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    division_analysis(dataset)
\ No newline at end of file
@@ -1,97 +1,97 @@
 import streamlit as st
 import pandas as pd
+import tempfile
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
-from io import BytesIO
-import re
+import numpy as np
+from pages.result_dataset import MISSING, subject_code
+from pages.exports import export_button
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
+# Students assembled per block of report rows; bounds memory beyond the write-only workbook
+ROW_CHUNK = 2048
 
-def create_excel_sheet():
-    data2 = load_data("Result_dict")
-    if not data2:
-        st.warning("No detailed data available. Please process a PDF first.")
-        return
-    
-    with st.spinner("Creating Excel sheet..."):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Student Results"
+def report_rows(dataset, chunk_size=ROW_CHUNK):
+    """Cells of every student row, assembled column-wise from the dataset's arrays a chunk at a time"""
+    n_students, n_subjects = len(dataset), len(dataset.subjects)
+
+    # Grand total over the first 9 subjects printed for each student, fail if any of the first 16 is "F"
+    position = dataset.position
+    total = dataset.marks['Total']
+    total_vals = np.where((position >= 0) & (position < 9) & (total != MISSING), total, 0).sum(axis=1)
+    failed = ((position >= 0) & (position < 16) & (dataset.tokens['Status1'] == "F")).any(axis=1)
+    seat_nos = dataset.students["Seat No"].to_numpy(dtype=object)
+    names = dataset.students["Name"].to_numpy(dtype=object)
 
-        all_codes = []
-        for code in data2[0]['Code']:
-            if isinstance(code, str):
-                all_codes.append(code)
+    for start in range(0, n_students, chunk_size):
+        rows = slice(start, min(start + chunk_size, n_students))
+        # Seat no, name, 5 cells per subject, then the summary columns. Tokens are ""
+        # for subjects a student does not take, so no per-cell checks are needed.
+        grid = np.full((rows.stop - rows.start, 2 + 5 * n_subjects + 4), "", dtype=object)
+        grid[:, 0] = seat_nos[rows]
+        grid[:, 1] = names[rows]
+        for offset, field in enumerate(('UA', 'CA', 'Total', 'Status1'), 1):
+            grid[:, 2 + offset:2 + 5 * n_subjects:5] = dataset.tokens[field][rows]
+        chunk_totals = total_vals[rows].tolist()
+        grid[:, -3] = chunk_totals
+        grid[:, -2] = np.where(failed[rows], "Fail", "Pass")
+        grid[:, -1] = [f"{(total_val / 900) * 100:.2f}" for total_val in chunk_totals]
+        yield from grid.tolist()
 
-        header = ["Seat No", "Name"]
-        for code in all_codes:
-            header.extend([code, "UA", "CA", "Total", "Subject_Status"])
-        header.extend(["", "Total", "Status", "Percentage"])
-        ws.append(header)
+def build_excel_report(dataset, path=None):
+    """Workbook with every student's subject-wise marks, as an open .xlsx file.
 
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
+    Rows are streamed through a write-only workbook into path (a temporary
+    file when None), so memory stays flat however many students there are.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Student Results")
+    bold = Font(bold=True)
 
-        code_indices = {i: code for i, code in enumerate(all_codes)}
-        
-        for student in data2[:]:
-            row = [student["Seat No"], student["Name"]]
-            seen_indices = set()
-            total_val = 0
-            status = ""
-            
-            if "F" in student.get("Status1", [])[:16]:
-                status = "Fail"
-            else:
-                status = "Pass"
+    def bold_cell(value):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = bold
+        return cell
 
-            for val in student["Total"][:9]:
-                if val in ('AB', '-', '*'):
-                    continue
-                elif '*' in val:
-                    parts = val.split()
-                    if len(parts) == 2 and parts[1].isdigit():
-                        total_val += int(parts[1])
-                elif '$' in val and '+' in val:
-                    match = re.search(r'\$?\s*(\d+)\s*\+\s*(\d+)', val)
-                    if match:
-                        total_val += int(match.group(1)) + int(match.group(2))
-                elif val.isdigit():
-                    total_val += int(val)
+    header = ["Seat No", "Name"]
+    for subject in dataset.subjects:
+        header.extend([subject_code(subject), "UA", "CA", "Total", "Subject_Status"])
+    header.extend(["", "Total", "Status", "Percentage"])
+    ws.append([bold_cell(value) for value in header])
 
-            percentage = f"{(total_val / 900) * 100:.2f}"
+    for cells in report_rows(dataset):
+        cells[0] = bold_cell(cells[0])
+        ws.append(cells)
 
-            for code in all_codes:
-                if code in code_indices.values():
-                    item = [k for k, v in code_indices.items() if v == code and k not in seen_indices]
-                    if item: 
-                        i = item[0]
-                        seen_indices.add(i)
-                        row.extend(["", student["UA"][i], student["CA"][i], student["Total"][i], student["Status1"][i]])
-                else:
-                    row.extend(["", "", "", "", ""])
-            
-            row.extend(["", total_val, status, percentage])
-            ws.append(row)
-            current_row = ws.max_row
-            ws[f"A{current_row}"].font = Font(bold=True)
+    excel_file = open(path, "w+b") if path else tempfile.TemporaryFile(suffix=".xlsx")
+    wb.save(excel_file)
+    excel_file.seek(0)
+    return excel_file
 
-        excel_buffer = BytesIO()
-        wb.save(excel_buffer)
-        excel_buffer.seek(0)
-        
-        st.success("Excel sheet created successfully!")
-        st.download_button(
-            label="📥 Download Excel File",
-            data=excel_buffer,
-            file_name="BCS-II_Results.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+def excel_report_bytes(dataset):
+    """The finished .xlsx; the workbook is streamed to a temporary file and only the result is read back"""
+    with build_excel_report(dataset) as excel_file:
+        return excel_file.read()
+
+def create_excel_sheet():
+    dataset = load_data("Dataset")
+    if not dataset:
+        st.warning("No detailed data available. Please process a PDF first.")
+        return
+    
+    # The workbook is built when the button is clicked, then reused for this dataset
+    export_button(
+        dataset,
+        label="📥 Download Excel File",
+        export="excel_report",
+        params=(),
+        build=lambda: excel_report_bytes(dataset),
+        file_name="BCS-II_Results.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
 def show():
     st.header("📝 Generate Detailed Excel Report")
     st.info("This will create a comprehensive Excel sheet with all student marks.")
-    if st.button("Generate Excel"):
-        create_excel_sheet()
\ No newline at end of file
+    create_excel_sheet()
\ No newline at end of file
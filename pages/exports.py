@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+import streamlit as st
+from pages import instrumentation
+
+# Generated files kept for reuse across reruns and sessions, least recently used dropped first
+MAX_EXPORT_BYTES = 64 * 1024 * 1024
+
+_lock = threading.Lock()
+_exports = OrderedDict()
+_export_bytes = 0
+
+def export_data(dataset, export, params, build):
+    """File contents for (dataset, export, params), calling build() only on a cache miss.
+
+    build must return bytes derived only from the dataset and params, since
+    the cached file is shared across sessions.
+    """
+    global _export_bytes
+    key = (dataset.fingerprint, export, params)
+    with _lock:
+        data = _exports.get(key)
+        if data is not None:
+            _exports.move_to_end(key)
+            instrumentation.count("export_cache_hits")
+            return data
+
+    with instrumentation.timed(f"export:{export}", profile=True):
+        data = build()
+    with _lock:
+        if key not in _exports:
+            _exports[key] = data
+            _export_bytes += len(data)
+        _exports.move_to_end(key)
+        while _export_bytes > MAX_EXPORT_BYTES and len(_exports) > 1:
+            _, dropped = _exports.popitem(last=False)
+            _export_bytes -= len(dropped)
+    return data
+
+def export_button(dataset, label, export, params, build, file_name, mime, key=None):
+    """Download button whose file is only generated (or taken from the cache) when it is clicked"""
+    return st.download_button(
+        label=label,
+        data=lambda: export_data(dataset, export, params, build),
+        file_name=file_name,
+        mime=mime,
+        key=key,
+        # Downloading does not rerun the page, so results shown after a button click stay on screen
+        on_click="ignore"
+    )
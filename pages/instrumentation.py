@@ -0,0 +1,151 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Off by default. RESULT_INSTRUMENTATION=1 records stage timings and counters, "profile" also keeps
+# a cProfile report of the latest run of each profiled stage. When off, timed() hands back a shared
+# no-op context manager, so instrumented code pays almost nothing.
+MODE = os.environ.get("RESULT_INSTRUMENTATION", "").strip().lower()
+ENABLED = MODE not in ("", "0", "off", "false")
+PROFILING = MODE == "profile"
+# Lines of each cProfile report kept, sorted by cumulative time
+PROFILE_LINES = 30
+
+_lock = threading.Lock()
+_profiling = False
+_NOOP = nullcontext()
+
+def _empty():
+    return {'stages': {}, 'counters': {}, 'profiles': {}}
+
+_metrics = _empty()
+_since = datetime.now().isoformat(timespec="seconds")
+
+def timed(stage, profile=False):
+    """Context manager recording how long a stage took; profile=True also captures cProfile"""
+    if not ENABLED:
+        return _NOOP
+    return _timed(stage, profile and PROFILING)
+
+def _start_profiler():
+    """A running profiler, or None while another one is active in this process"""
+    global _profiling
+    # Only one profiler can run per process (Python 3.12+ enforces it across threads), so stages
+    # that start while one is running, nested or on another thread, are timed but not profiled
+    with _lock:
+        if _profiling:
+            return None
+        _profiling = True
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Some other profiling tool is active
+        with _lock:
+            _profiling = False
+        return None
+    return profiler
+
+def _stop_profiler(profiler):
+    global _profiling
+    profiler.disable()
+    with _lock:
+        _profiling = False
+
+@contextmanager
+def _timed(stage, profile):
+    profiler = _start_profiler() if profile else None
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if profiler is not None:
+            _stop_profiler(profiler)
+        record(stage, seconds)
+        if profiler is not None:
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            with _lock:
+                _metrics['profiles'][stage] = report.getvalue()
+
+def record(stage, seconds, calls=1, max_seconds=None):
+    """Add calls runs of a stage taking seconds in total"""
+    if not ENABLED:
+        return
+    with _lock:
+        stats = _metrics['stages'].get(stage)
+        if stats is None:
+            stats = _metrics['stages'][stage] = {'count': 0, 'total_s': 0.0, 'max_s': 0.0}
+        stats['count'] += calls
+        stats['total_s'] += seconds
+        stats['max_s'] = max(stats['max_s'], seconds if max_seconds is None else max_seconds)
+
+def count(counter, n=1):
+    """Increase a counter (pages, students, lines, cache hits, ...)"""
+    if not ENABLED:
+        return
+    with _lock:
+        _metrics['counters'][counter] = _metrics['counters'].get(counter, 0) + n
+
+def drain():
+    """Metrics recorded in this process since the last drain, then reset; None when disabled.
+
+    Pool workers send this back with their results so the parent can merge() it.
+    """
+    global _metrics
+    if not ENABLED:
+        return None
+    with _lock:
+        drained, _metrics = _metrics, _empty()
+    return drained
+
+def reset():
+    """Forget everything recorded in this process and restart the "since" time.
+
+    The Instrumentation page calls this to start a fresh measurement. Pool
+    workers call it on start, because a forked worker inherits the parent's
+    metrics, which would otherwise be drained and merged back a second time.
+    """
+    global _metrics, _since
+    with _lock:
+        _metrics = _empty()
+        _since = datetime.now().isoformat(timespec="seconds")
+
+def merge(metrics):
+    """Fold metrics drained in another process into this one"""
+    if not metrics:
+        return
+    for stage, stats in metrics['stages'].items():
+        record(stage, stats['total_s'], stats['count'], stats['max_s'])
+    for counter, n in metrics['counters'].items():
+        count(counter, n)
+    with _lock:
+        _metrics['profiles'].update(metrics['profiles'])
+
+def snapshot():
+    """Everything recorded so far as plain data, with a mean per stage"""
+    with _lock:
+        stages = {
+            stage: dict(stats, mean_s=stats['total_s'] / stats['count'] if stats['count'] else 0.0)
+            for stage, stats in _metrics['stages'].items()
+        }
+        return {
+            'enabled': ENABLED,
+            'profiling': PROFILING,
+            'since': _since,
+            'taken_at': datetime.now().isoformat(timespec="seconds"),
+            'pid': os.getpid(),
+            'stages': stages,
+            'counters': dict(_metrics['counters']),
+            'profiles': dict(_metrics['profiles']),
+        }
+
+def to_json(indent=2):
+    return json.dumps(snapshot(), indent=indent, sort_keys=True)
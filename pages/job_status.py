@@ -0,0 +1,61 @@
+import time
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from pages import jobs
+from pages.storage import select_upload
+
+def job_rows(job_list):
+    """One row per job: status, progress, size and how long it waited and ran"""
+    now = time.time()
+    rows = []
+    for job in job_list:
+        waited, ran = jobs.job_seconds(job, now)
+        total_pages = job.get('total_pages')
+        pages_done = total_pages if job['status'] == jobs.DONE else job.get('pages_done', 0)
+        rows.append({
+            'Job': job['id'],
+            'File': job['name'],
+            'Status': job['status'].title(),
+            'Submitted': datetime.fromtimestamp(job['submitted_at']).strftime("%H:%M:%S"),
+            'Pages': f"{pages_done}/{total_pages}" if total_pages else ("cached" if job.get('cached') else "-"),
+            'Students': job.get('students'),
+            'Reused Pages': job.get('reused_pages'),
+            'Wait (s)': round(waited, 1),
+            'Run (s)': round(ran, 1) if ran is not None else None,
+            'Pages/s': round(pages_done / ran, 1) if total_pages and ran else None,
+            'Upload': job.get('upload_id'),
+            'Error': job['error'] or "",
+        })
+    # Counts stay whole numbers next to the jobs that don't have them yet
+    return pd.DataFrame(rows).astype({'Students': 'Int64', 'Reused Pages': 'Int64', 'Upload': 'Int64'}) if rows else pd.DataFrame()
+
+@st.fragment(run_every=2)
+def job_table():
+    """Every job known to this server, refreshed every two seconds"""
+    job_list = jobs.list_jobs()
+    statuses = [job['status'] for job in job_list]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Running", statuses.count(jobs.RUNNING))
+    col2.metric("Queued", statuses.count(jobs.QUEUED))
+    col3.metric("Finished", statuses.count(jobs.DONE))
+    col4.metric("Failed", statuses.count(jobs.FAILED))
+    st.caption(f"{jobs.MAX_RUNNING_JOBS} PDF(s) are processed at a time and up to {jobs.MAX_PENDING_JOBS} "
+               f"accepted; the last {jobs.MAX_FINISHED_JOBS} finished jobs are kept.")
+
+    if not job_list:
+        st.info("No PDFs have been processed since the server started.")
+        return
+    st.dataframe(job_rows(job_list), hide_index=True)
+
+def show():
+    st.header("⚙️ Background Jobs")
+    job_table()
+
+    finished = {f"#{job['id']} {job['name']}": job['upload_id']
+                for job in jobs.list_jobs() if job['status'] == jobs.DONE}
+    if finished:
+        choice = st.selectbox("Open the results of a finished job", list(finished), key="finished_job")
+        if st.button("Open Results", key="open_job_results"):
+            select_upload(finished[choice])
+            st.success(f"✅ Opened {choice}")
@@ -0,0 +1,97 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pages import instrumentation
+
+# Jobs run at once on background threads; the rest wait in the queue
+MAX_RUNNING_JOBS = max(1, int(os.environ.get("RESULT_JOB_WORKERS", "2")))
+# Jobs accepted (queued or running) before submit() turns new ones away
+MAX_PENDING_JOBS = max(1, int(os.environ.get("RESULT_JOB_QUEUE", "8")))
+# Finished jobs kept for the status page, oldest dropped first
+MAX_FINISHED_JOBS = 50
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+ACTIVE = (QUEUED, RUNNING)
+
+_lock = threading.Lock()
+_jobs = OrderedDict()
+_ids = itertools.count(1)
+_executor = None
+
+def page_workers():
+    """Page-pool size for one job, so concurrent jobs share the cores instead of each taking all of them"""
+    return max(1, (os.cpu_count() or 1) // MAX_RUNNING_JOBS)
+
+def submit(name, run, *args):
+    """Queue run(job_id, *args) on a background thread and return the job id, or None if the queue is full.
+
+    run reports progress through update(job_id, ...) and returns a dict of
+    result fields that is merged into the job when it finishes. Jobs are
+    shared by every session on the server.
+    """
+    global _executor
+    with _lock:
+        if sum(job['status'] in ACTIVE for job in _jobs.values()) >= MAX_PENDING_JOBS:
+            instrumentation.count("jobs_rejected")
+            return None
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_RUNNING_JOBS, thread_name_prefix="result-job")
+        job_id = next(_ids)
+        _jobs[job_id] = {
+            'id': job_id,
+            'name': name,
+            'status': QUEUED,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+        }
+        _prune()
+    instrumentation.count("jobs_submitted")
+    _executor.submit(_run, job_id, run, args)
+    return job_id
+
+def _run(job_id, run, args):
+    update(job_id, status=RUNNING, started_at=time.time())
+    try:
+        with instrumentation.timed("job", profile=True):
+            result = run(job_id, *args) or {}
+    except Exception as e:
+        instrumentation.count("jobs_failed")
+        update(job_id, status=FAILED, error=str(e) or type(e).__name__, finished_at=time.time())
+    else:
+        update(job_id, status=DONE, finished_at=time.time(), **result)
+
+def _prune():
+    finished = [job_id for job_id, job in _jobs.items() if job['status'] not in ACTIVE]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+def update(job_id, **fields):
+    """Set fields (progress, results) of a job"""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+def get_job(job_id):
+    """Copy of a job's fields, or None if it is unknown (or was dropped)"""
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+def list_jobs():
+    """Copies of all known jobs, newest first"""
+    with _lock:
+        return [dict(job) for job in reversed(_jobs.values())]
+
+def job_seconds(job, now=None):
+    """(seconds waited in the queue, seconds run so far or in total); None for a stage not reached"""
+    now = now or time.time()
+    started, finished = job['started_at'], job['finished_at']
+    waited = (started or now) - job['submitted_at']
+    ran = (finished or now) - started if started is not None else None
+    return waited, ran
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Parsed results live next to the app so every staff session on the server shares them
+CACHE_DIR = os.environ.get(
+    "RESULT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "parsed")
+)
+MAX_CACHE_BYTES = int(os.environ.get("RESULT_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+def cache_key(pdf_bytes, parser_version):
+    """Content address of an uploaded PDF for a given parser version"""
+    return f"{hashlib.sha256(pdf_bytes).hexdigest()}-v{parser_version}"
+
+def file_cache_key(path, parser_version, chunk_size=1024 * 1024):
+    """cache_key of a PDF on disk, hashed in chunks instead of loading the whole file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}-v{parser_version}"
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+def get(key):
+    """Return the cached parse for key, or None on a miss"""
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or unreadable entry - drop it and parse again
+        _remove(path)
+        return None
+
+    # Bump the modification time so eviction treats this entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+def put(key, value):
+    """Store a parse result and evict least recently used entries beyond MAX_CACHE_BYTES"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename so concurrent sessions never read a half-written entry
+        os.replace(tmp_path, _entry_path(key))
+    except Exception:
+        _remove(tmp_path)
+        raise
+    _evict(MAX_CACHE_BYTES)
+
+def _evict(max_bytes):
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,22 +1,21 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
+from pages.result_dataset import summary_rows
+from pages.charts import show_chart
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
-
-def find_pass_fail(data):
-    if not data:
+def find_pass_fail(dataset):
+    if not dataset:
         st.warning("No data available. Please upload and process a PDF first.")
         return
     
-    passed = [d for d in data if d["Status"] == "Pass"]
-    failed = [d for d in data if d["Status"] in ["ATKT", "Fail"]]
+    summary = dataset.summary
+    passed = summary[summary['Passed']]
+    failed = summary[summary['Failed']]
     
     st.subheader("Pass/Fail Analysis")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Students", len(data))
+    col1.metric("Total Students", len(summary))
     col2.metric("Passed Students", len(passed), f"+{len(passed)}")
     col3.metric("Failed Students", len(failed), f"-{len(failed)}")
     
@@ -31,41 +30,45 @@ def find_pass_fail(data):
         )
         
         if option == "All Students":
-            st.dataframe(pd.DataFrame(data))
+            st.dataframe(summary_rows(summary))
         elif option == "Passed Students":
-            st.dataframe(pd.DataFrame(passed))
+            st.dataframe(summary_rows(passed))
         else:
-            st.dataframe(pd.DataFrame(failed))
+            st.dataframe(summary_rows(failed))
     
     with tab2:
         # Create pie chart for pass/fail distribution with consistent size
-        fig, ax = plt.subplots(figsize=(6, 6))
-        sizes = [len(passed), len(failed)]
-        labels = ['Passed', 'Failed']
-        colors = ['#4CAF50', '#F44336']
+        def draw():
+            fig, ax = plt.subplots(figsize=(6, 6))
+            sizes = [len(passed), len(failed)]
+            labels = ['Passed', 'Failed']
+            colors = ['#4CAF50', '#F44336']
         
-        ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-            textprops={'fontsize': 10}
-        )
-        ax.set_title('Pass/Fail Distribution', pad=20)
-        ax.axis('equal')
-        st.pyplot(fig)
+            ax.pie(
+                sizes,
+                labels=labels,
+                autopct='%1.1f%%',
+                startangle=90,
+                colors=colors,
+                wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+                textprops={'fontsize': 10}
+            )
+            ax.set_title('Pass/Fail Distribution', pad=20)
+            ax.axis('equal')
+            return fig
+        show_chart(dataset, "pass_fail_pie", (), draw)
         
         # Add bar chart for pass/fail comparison
-        fig2, ax2 = plt.subplots(figsize=(6, 4))
-        ax2.bar(['Passed', 'Failed'], [len(passed), len(failed)], color=['#4CAF50', '#F44336'])
-        ax2.set_ylabel('Number of Students')
-        ax2.set_title('Pass/Fail Comparison')
-        for i, v in enumerate([len(passed), len(failed)]):
-            ax2.text(i, v + 0.5, str(v), ha='center')
-        st.pyplot(fig2)
+        def draw():
+            fig2, ax2 = plt.subplots(figsize=(6, 4))
+            ax2.bar(['Passed', 'Failed'], [len(passed), len(failed)], color=['#4CAF50', '#F44336'])
+            ax2.set_ylabel('Number of Students')
+            ax2.set_title('Pass/Fail Comparison')
+            for i, v in enumerate([len(passed), len(failed)]):
+                ax2.text(i, v + 0.5, str(v), ha='center')
+            return fig2
+        show_chart(dataset, "pass_fail_bar", (), draw)
 
 def show():
-    data = load_data("Shoert_data")
-    find_pass_fail(data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    find_pass_fail(dataset)
\ No newline at end of file
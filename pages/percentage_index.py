@@ -0,0 +1,65 @@
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+# Division bands by lower percentage bound, highest first. Students below the lowest
+# bound, or with a failed status (ATKT/Fail) whatever their percentage, are in "Fail".
+DIVISION_BANDS = [
+    ('Distinction', 75.0),
+    ('First Class', 60.0),
+    ('Second Class', 50.0),
+    ('Pass Class', 40.0),
+]
+FAIL_DIVISION = 'Fail'
+DIVISION_ORDER = [name for name, _ in DIVISION_BANDS] + [FAIL_DIVISION]
+
+class PercentageIndex:
+    """Students sorted by percentage, so a percentage range is two binary searches.
+
+    ``sorted_pct`` is the float32 percentages in ascending order (unreadable
+    percentages, NaN, sort last) and ``order`` the summary rows in that
+    order. ``name_rank`` is each row's position in a stable sort by name,
+    used to put a range's rows in name order without comparing strings.
+    """
+
+    def __init__(self, summary):
+        self.summary = summary
+        percentage = summary['Percentage'].to_numpy(dtype=np.float32)
+        self.order = np.argsort(percentage, kind='stable')
+        self.sorted_pct = percentage[self.order]
+        self.count = int(np.count_nonzero(~np.isnan(percentage)))
+        self.name_rank = np.empty(len(summary), dtype=np.intp)
+        self.name_rank[np.argsort(summary['Name'].to_numpy(dtype=object), kind='stable')] = np.arange(len(summary))
+        self.status_codes = summary['Status'].cat.codes.to_numpy()
+
+    def max(self):
+        """Highest readable percentage, or None when there is none"""
+        return float(self.sorted_pct[self.count - 1]) if self.count else None
+
+    def range(self, min_pct, max_pct, statuses=None):
+        """Rows with min_pct <= Percentage <= max_pct (and Status in statuses), in name order.
+
+        Bounds are compared as float32 like the stored percentages, so 70.1 still matches "70.10".
+        """
+        start = np.searchsorted(self.sorted_pct[:self.count], np.float32(min_pct), side='left')
+        stop = np.searchsorted(self.sorted_pct[:self.count], np.float32(max_pct), side='right')
+        rows = self.order[start:max(start, stop)]
+        if statuses is not None:
+            wanted = self.summary['Status'].cat.categories.get_indexer(list(statuses))
+            rows = rows[np.isin(self.status_codes[rows], wanted[wanted >= 0])]
+        return rows[np.argsort(self.name_rank[rows], kind='stable')]
+
+    @cached_property
+    def divisions(self):
+        """Division of every student in one vectorized pass, as a categorical in DIVISION_ORDER.
+
+        Students who passed without a readable percentage get no division (NaN).
+        """
+        percentage = self.summary['Percentage'].to_numpy(dtype=np.float32)
+        # Ascending lower bounds; searchsorted counts how many bands each percentage clears
+        bounds = np.array([bound for _, bound in reversed(DIVISION_BANDS)], dtype=np.float32)
+        cleared = np.searchsorted(bounds, percentage, side='right')
+        codes = np.where(cleared > 0, len(DIVISION_BANDS) - cleared, len(DIVISION_BANDS))
+        codes[np.isnan(percentage)] = -1
+        codes[self.summary['Failed'].to_numpy()] = len(DIVISION_BANDS)
+        return pd.Categorical.from_codes(codes, DIVISION_ORDER)
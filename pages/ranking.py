@@ -0,0 +1,70 @@
+import threading
+import numpy as np
+
+# Tie handling for ranks: competition gives 1, 2, 2, 4 and dense gives 1, 2, 2, 3
+TIE_METHODS = ['competition', 'dense']
+OVERALL = None
+
+def top_n(values, n, threshold=None):
+    """Rows of the n highest values above threshold, highest first (ties in row order).
+
+    Selection uses np.partition, so it is linear in the number of students;
+    only the selected rows are sorted. NaN values are never selected.
+    """
+    values = np.asarray(values)
+    rows = np.flatnonzero(values > threshold) if threshold is not None else np.flatnonzero(~np.isnan(values))
+    if n <= 0:
+        return rows[:0]
+    if len(rows) > n:
+        candidates = values[rows]
+        nth = np.partition(candidates, len(candidates) - n)[len(candidates) - n]
+        above = rows[candidates > nth]
+        # Values tied with the n-th highest are taken in row order, like a stable sort would
+        tied = rows[candidates == nth][:n - len(above)]
+        rows = np.concatenate([above, tied])
+    return rows[np.lexsort((rows, -values[rows]))]
+
+def rank(values, method='competition'):
+    """Rank of every value, 1 for the highest; NaN values get rank 0"""
+    values = np.asarray(values)
+    valid = ~np.isnan(values)
+    ranks = np.zeros(len(values), dtype=np.int32)
+    ordered = np.sort(values[valid])
+    if method == 'dense':
+        ordered = np.unique(ordered)
+    elif method != 'competition':
+        raise ValueError(f"Unknown tie method {method!r}, expected one of {TIE_METHODS}")
+    # 1 + how many (distinct) values are strictly higher
+    ranks[valid] = len(ordered) - np.searchsorted(ordered, values[valid], side='right') + 1
+    return ranks
+
+class Rankings:
+    """Scores and memoized ranks of one dataset, overall (by percentage) and per subject"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self._ranks = {}
+        self._lock = threading.Lock()
+
+    def scores(self, subject=OVERALL):
+        """float32 percentage per student, or a subject's Total marks with NaN where there is none"""
+        if subject is OVERALL:
+            return self.dataset.summary['Percentage'].to_numpy(dtype=np.float32)
+        return self.dataset.subject_totals(subject)
+
+    def ranks(self, subject=OVERALL, method='competition'):
+        """Rank of every student by score, computed once per subject and tie method"""
+        key = (subject, method)
+        with self._lock:
+            ranks = self._ranks.get(key)
+        if ranks is None:
+            ranks = rank(self.scores(subject), method)
+            with self._lock:
+                self._ranks[key] = ranks
+        return ranks
+
+    def top(self, n, threshold=None, subject=OVERALL, method='competition'):
+        """(rows, scores, ranks) of the top n students above threshold, highest first"""
+        scores = self.scores(subject)
+        rows = top_n(scores, n, threshold)
+        return rows, scores[rows], self.ranks(subject, method)[rows]
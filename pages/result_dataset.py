@@ -0,0 +1,246 @@
+import hashlib
+import re
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from pages.percentage_index import PercentageIndex
+from pages.ranking import Rankings
+from pages.search_index import StudentIndex
+
+# int16 value stored for a blank, "-" or unreadable mark; absent ("AB") cells also hold it
+MISSING = -1
+MARK_FIELDS = ['UA', 'CA', 'Total']
+STUDENT_COLUMNS = ['Seat No', 'Name', 'PRN No', 'Percentage', 'Status']
+# Overall result statuses printed by the university, in display order
+STATUS_ORDER = ['Pass', 'ATKT', 'Fail']
+FAILED_STATUSES = ['ATKT', 'Fail']
+SUMMARY_DISPLAY_COLUMNS = ['Seat No', 'Name', 'Percentage', 'Status']
+
+_MARK_PATTERN = re.compile(r'^(?:\*\s*)?\$?\s*(\d+)(?:\s*\+\s*(\d+))?$')
+
+def parse_mark(token):
+    """Numeric value of a mark token -> (value, absent). Handles "12", "* 12" and "$ 14 + 2"."""
+    token = token.strip() if isinstance(token, str) else ''
+    if token == 'AB':
+        return MISSING, True
+    match = _MARK_PATTERN.match(token)
+    if not match:
+        return MISSING, False
+    value = int(match.group(1)) + int(match.group(2) or 0)
+    return value, False
+
+def subject_code(subject):
+    """Printable subject code of a dataset column (drops the "#2" duplicate suffix)"""
+    return subject.split('#', 1)[0]
+
+def subject_label(subject):
+    """Subject code of a dataset column, with "(2)" on a repeated code's second column so the two can be told apart"""
+    code, _, copy = subject.partition('#')
+    return f"{code} ({copy})" if copy else code
+
+def short_data(student_info):
+    """Summary rows (seat no, name, percentage, status) shown by the analytics pages"""
+    data = []
+    for record in student_info:
+        data.append({
+            "Seat No": record['Seat No'], 
+            "Name": record['Name'], 
+            "Percentage": record['Percentage'], 
+            "Status": record['Status']
+        })
+    return data
+
+class ResultDataset:
+    """Columnar view of one parsed result PDF.
+
+    ``students`` is one row per student (in PDF order). Marks are dense
+    ``(students x subjects)`` int16 matrices in ``marks`` with ``absent``
+    masks, ``status`` holds the categorical per-subject status, ``tokens``
+    the raw text of each cell for display, ``taken`` marks the cells a
+    student actually has and ``position`` gives each of them its index in
+    the student's own printed subject list (-1 elsewhere). A subject code that appears twice on a result
+    gets a ``#2`` suffix for its second column.
+    """
+
+    def __init__(self, students, subjects, marks, absent, status, tokens, taken, position, key=None):
+        self.students = students
+        self.subjects = subjects
+        self.marks = marks
+        self.absent = absent
+        self.status = status
+        self.tokens = tokens
+        self.taken = taken
+        self.position = position
+        self.key = key
+
+    def __len__(self):
+        return len(self.students)
+
+    def subject_index(self, subject):
+        return self.subjects.index(subject)
+
+    def student_subjects(self, row):
+        """Column indices of the subjects a student took, in column order"""
+        return np.flatnonzero(self.taken[row])
+
+    def subject_totals(self, subject):
+        """float32 Total marks of one subject per student, NaN where the student has none"""
+        col = self.subject_index(subject)
+        total = self.marks['Total'][:, col]
+        return np.where(self.taken[:, col] & (total != MISSING), total, np.nan).astype(np.float32)
+
+    @cached_property
+    def rankings(self):
+        """Overall and per-subject scores with ranks memoized per tie method"""
+        return Rankings(self)
+
+    @cached_property
+    def fingerprint(self):
+        """Stable identity of the dataset's contents for caches: the upload key, or a content hash"""
+        if self.key is not None:
+            return self.key
+        digest = hashlib.sha256(pd.util.hash_pandas_object(self.students, index=False).to_numpy().tobytes())
+        digest.update('\0'.join(self.subjects).encode())
+        for field in MARK_FIELDS:
+            digest.update(self.marks[field].tobytes())
+        digest.update(self.status.apply(lambda column: column.cat.codes).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @cached_property
+    def search_index(self):
+        """Seat No / PRN map and name n-gram index for the search page, built on first use"""
+        return StudentIndex(self.students)
+
+    @cached_property
+    def percentage_index(self):
+        """Summary rows sorted by percentage for range queries and division bands, built on first use"""
+        return PercentageIndex(self.summary)
+
+    @cached_property
+    def summary(self):
+        """Typed per-student summary shared by the analytics pages, built once per dataset.
+
+        Percentage is float32, Status categorical, Passed/Failed are
+        precomputed flags and Rank is the competition rank by percentage.
+        Pages share this frame, so treat it as read-only.
+        """
+        status = self.students['Status']
+        extra = sorted(set(status.dropna()) - set(STATUS_ORDER))
+        percentage = self.students['Percentage'].astype(np.float32)
+        return pd.DataFrame({
+            'Seat No': self.students['Seat No'],
+            'Name': self.students['Name'],
+            'Percentage': percentage,
+            'Status': pd.Categorical(status, categories=STATUS_ORDER + extra),
+            'Passed': (status == 'Pass').to_numpy(),
+            'Failed': status.isin(FAILED_STATUSES).to_numpy(),
+            'Rank': percentage.rank(ascending=False, method='min').astype('Int32'),
+        })
+
+    @cached_property
+    def subject_stats(self):
+        """Per-subject distribution of Total marks, one row per subject, built once per dataset.
+
+        Students counts the numeric marks the statistics are taken over,
+        Absent the students marked "AB", and Pass Rate is the share of
+        counted students with subject status "P". A code printed twice on
+        a marksheet (its "#2" column) is one subject: its columns are
+        counted together.
+        """
+        columns = {}
+        for col, subject in enumerate(self.subjects):
+            columns.setdefault(subject_code(subject), []).append(col)
+        total = self.marks['Total']
+        valid = self.taken & (total != MISSING)
+        # NaN outside the counted cells, so every column reduction skips them in one vectorized pass;
+        # the columns of a repeated code are stacked into one
+        cells = np.where(valid, total, np.nan)
+        values = pd.DataFrame({code: pd.Series(cells[:, cols].ravel()) for code, cols in columns.items()})
+        quartiles = values.quantile([0.25, 0.5, 0.75])
+
+        def per_code(counts):
+            return np.array([counts[cols].sum() for cols in columns.values()], dtype=int)
+        students = per_code(valid.sum(axis=0))
+        passed = per_code((valid & self.status.eq('P').to_numpy()).sum(axis=0))
+        absent = per_code((self.taken & np.logical_or.reduce([self.absent[field] for field in MARK_FIELDS])).sum(axis=0))
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pass_rate = passed / students * 100
+        return pd.DataFrame({
+            'Subject': list(columns),
+            'Students': students,
+            'Absent': absent,
+            'Mean': values.mean().to_numpy(),
+            'Median': quartiles.loc[0.5].to_numpy(),
+            'Std': values.std().to_numpy(),
+            'Min': values.min().to_numpy(),
+            'Q1': quartiles.loc[0.25].to_numpy(),
+            'Q3': quartiles.loc[0.75].to_numpy(),
+            'Max': values.max().to_numpy(),
+            'Passed': passed,
+            'Failed': students - passed,
+            'Pass Rate': pass_rate,
+        })
+
+def summary_rows(frame):
+    """Seat No / Name / Percentage / Status columns of summary rows, formatted for tables and exports"""
+    return frame[SUMMARY_DISPLAY_COLUMNS].assign(
+        Percentage=frame['Percentage'].astype(float).round(2),
+        Status=frame['Status'].astype(str)
+    )
+
+def build_dataset(student_info, key=None):
+    """Build the columnar dataset from the extractor's per-student records in one pass"""
+    subjects = []
+    subject_pos = {}
+    cells = []
+
+    for row, record in enumerate(student_info):
+        seen = {}
+        for i, code in enumerate(record.get('Code', [])):
+            if not isinstance(code, str):
+                continue
+            seen[code] = seen.get(code, 0) + 1
+            subject = code if seen[code] == 1 else f"{code}#{seen[code]}"
+            col = subject_pos.get(subject)
+            if col is None:
+                col = subject_pos[subject] = len(subjects)
+                subjects.append(subject)
+            cells.append((row, col, i))
+
+    n_students, n_subjects = len(student_info), len(subjects)
+    shape = (n_students, n_subjects)
+    marks = {field: np.full(shape, MISSING, dtype=np.int16) for field in MARK_FIELDS}
+    absent = {field: np.zeros(shape, dtype=bool) for field in MARK_FIELDS}
+    tokens = {field: np.full(shape, '', dtype=object) for field in MARK_FIELDS + ['Status1']}
+    taken = np.zeros(shape, dtype=bool)
+    position = np.full(shape, -1, dtype=np.int16)
+
+    # Mark tokens repeat heavily (0-100, "AB", ...), so each distinct token is parsed once
+    parsed = {}
+    for row, col, i in cells:
+        record = student_info[row]
+        taken[row, col] = True
+        position[row, col] = i
+        for field in MARK_FIELDS:
+            token = record[field][i]
+            tokens[field][row, col] = token
+            value = parsed.get(token)
+            if value is None:
+                value = parsed[token] = parse_mark(token)
+            marks[field][row, col], absent[field][row, col] = value
+        tokens['Status1'][row, col] = record['Status1'][i]
+
+    status_codes = pd.Categorical(tokens['Status1'].ravel())
+    status = pd.DataFrame(
+        status_codes.codes.reshape(shape),
+        columns=subjects
+    ).apply(lambda column: pd.Categorical.from_codes(column, status_codes.categories))
+
+    students = pd.DataFrame(
+        [[record.get(column, '') for column in STUDENT_COLUMNS] for record in student_info],
+        columns=STUDENT_COLUMNS
+    )
+    students['Percentage'] = pd.to_numeric(students['Percentage'], errors='coerce')
+
+    return ResultDataset(students, subjects, marks, absent, status, tokens, taken, position, key=key)
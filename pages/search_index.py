@@ -0,0 +1,66 @@
+import numpy as np
+
+# Queries up to this length are answered straight from the n-gram postings
+GRAM_SIZE = 3
+
+def normalize(text):
+    """Lower-case text with runs of whitespace collapsed, as names and queries are compared"""
+    return ' '.join(str(text).lower().split()) if isinstance(text, str) else ''
+
+def _grams(text, sizes=range(1, GRAM_SIZE + 1)):
+    """Every substring of text whose length is in sizes"""
+    return {text[i:i + n] for n in sizes for i in range(len(text) - n + 1)}
+
+class StudentIndex:
+    """Lookup structures over one dataset's students, built once and reused for every search.
+
+    ``ids`` maps each normalized Seat No and PRN No to its row. ``postings``
+    maps every 1-3 character substring of a student's Seat No, Name or PRN
+    to the sorted rows containing it, so a search intersects a few short
+    arrays instead of scanning every student.
+    """
+
+    def __init__(self, students):
+        self.fields = [
+            [normalize(value) for value in students[column]]
+            for column in ('Seat No', 'Name', 'PRN No')
+        ]
+        # One string per student for verifying matches; normalized queries never contain "\n"
+        self.text = ['\n'.join(values) for values in zip(*self.fields)]
+        self.ids = {}
+        postings = {}
+        for row in range(len(students)):
+            grams = set()
+            for values in self.fields:
+                grams |= _grams(values[row])
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        for values in (self.fields[0], self.fields[2]):
+            for row, value in enumerate(values):
+                if value:
+                    self.ids.setdefault(value, row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def lookup(self, key):
+        """Row of the student with this exact Seat No or PRN No, or None"""
+        return self.ids.get(normalize(key))
+
+    def search(self, query):
+        """Rows whose Seat No, Name or PRN No contains query (case-insensitive), in dataset order"""
+        query = normalize(query)
+        if not query:
+            return np.empty(0, dtype=np.int32)
+        if len(query) <= GRAM_SIZE:
+            return self.postings.get(query, np.empty(0, dtype=np.int32))
+
+        # Every trigram of the query must occur; intersect the rarest postings first
+        grams = sorted(_grams(query, [GRAM_SIZE]), key=lambda gram: len(self.postings.get(gram, ())))
+        rows = self.postings.get(grams[0], np.empty(0, dtype=np.int32))
+        for gram in grams[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, self.postings.get(gram, ()), assume_unique=True)
+
+        # Shared trigrams do not guarantee the whole query is present, so confirm each candidate
+        text = self.text
+        return np.array([row for row in rows.tolist() if query in text[row]], dtype=np.int32)
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pages.result_dataset import MARK_FIELDS, STUDENT_COLUMNS, ResultDataset
+
+# Bump whenever the snapshot layout changes; older snapshots are then rebuilt from the database
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".arrow"
+TOKEN_FIELDS = MARK_FIELDS + ['Status1']
+_METADATA_KEY = b"result_snapshot"
+
+def _matrix_column(matrix):
+    """(students x subjects) matrix as a fixed-size list column, one list per student, sharing its memory"""
+    if matrix.shape[1] == 0:
+        # Arrow has no zero-size lists; a dataset without subjects keeps one null per student instead
+        return pa.nulls(matrix.shape[0])
+    flat = np.ascontiguousarray(matrix).ravel()
+    return pa.FixedSizeListArray.from_arrays(pa.array(flat), matrix.shape[1])
+
+def _matrix(column, n_subjects, dtype):
+    """Inverse of _matrix_column: a read-only numpy view straight onto the snapshot's buffer"""
+    if n_subjects == 0:
+        return np.empty((len(column), 0), dtype=dtype)
+    chunks = column.chunks
+    if len(chunks) == 1:
+        values = chunks[0].flatten().to_numpy(zero_copy_only=True)
+    else:
+        values = np.concatenate([chunk.flatten().to_numpy(zero_copy_only=True) for chunk in chunks])
+    return values.view(dtype).reshape(-1, n_subjects)
+
+def dataset_table(dataset):
+    """Arrow table of a dataset: the student columns plus one fixed-size list column per matrix.
+
+    Marks and positions stay int16, the absent/taken masks are stored as uint8 bytes and
+    the status matrix as category codes, so all of them can be read back
+    without copying. Raw cell tokens repeat heavily and are stored as codes
+    into a per-field list of distinct values kept in the schema metadata.
+    """
+    n_subjects = len(dataset.subjects)
+    columns = {column: pa.array(dataset.students[column].to_numpy(dtype=object), from_pandas=True)
+               for column in STUDENT_COLUMNS}
+    for field in MARK_FIELDS:
+        columns[f"marks:{field}"] = _matrix_column(dataset.marks[field])
+        columns[f"absent:{field}"] = _matrix_column(dataset.absent[field].view(np.uint8))
+    columns["taken"] = _matrix_column(dataset.taken.view(np.uint8))
+    columns["position"] = _matrix_column(dataset.position)
+
+    status_categories = list(dataset.status.iloc[:, 0].cat.categories) if n_subjects else []
+    status_codes = np.column_stack([dataset.status[subject].cat.codes.to_numpy() for subject in dataset.subjects]) \
+        if n_subjects else np.empty((len(dataset), 0), dtype=np.int8)
+    columns["status"] = _matrix_column(status_codes.astype(np.int16))
+
+    token_values = {}
+    for field in TOKEN_FIELDS:
+        codes, uniques = pd.factorize(dataset.tokens[field].ravel(), use_na_sentinel=False)
+        columns[f"tokens:{field}"] = _matrix_column(codes.astype(np.int32).reshape(dataset.tokens[field].shape))
+        token_values[field] = list(uniques)
+
+    metadata = {
+        'version': SNAPSHOT_VERSION,
+        # Keeping the fingerprint as the key lets chart and export caches recognise a reloaded dataset
+        'key': dataset.fingerprint,
+        'subjects': dataset.subjects,
+        'status_categories': status_categories,
+        'tokens': token_values,
+    }
+    return pa.table(columns).replace_schema_metadata({_METADATA_KEY: json.dumps(metadata).encode()})
+
+def write_snapshot(dataset, sink):
+    """Write a dataset as an Arrow IPC file to a path or binary file object"""
+    table = dataset_table(dataset)
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        # One record batch, so every matrix column is a single contiguous buffer on reload
+        writer.write_table(table, max_chunksize=max(len(table), 1))
+
+def write_file(path, write):
+    """Create path through write(file) on a temporary file renamed into place, so readers never map half a file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_snapshot(dataset, path):
+    """Write a dataset's snapshot file atomically"""
+    write_file(path, lambda f: write_snapshot(dataset, f))
+
+def snapshot_bytes(dataset):
+    """Snapshot file contents of a dataset, for downloads"""
+    sink = pa.BufferOutputStream()
+    write_snapshot(dataset, sink)
+    return sink.getvalue().to_pybytes()
+
+def read_snapshot(source):
+    """ResultDataset from a snapshot given as a file path (memory-mapped) or bytes.
+
+    Mark, mask and status matrices are numpy views onto the mapped file, so
+    reloading costs little more than decoding the student table and tokens.
+    Raises ValueError for a file that is not a snapshot of this version.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buffer = pa.BufferReader(pa.py_buffer(source))
+    else:
+        # The arrays keep the mapping alive after this function returns
+        buffer = pa.memory_map(source, "r")
+    table = pa.ipc.open_file(buffer).read_all()
+
+    raw = (table.schema.metadata or {}).get(_METADATA_KEY)
+    if raw is None:
+        raise ValueError("not a result dataset snapshot")
+    metadata = json.loads(raw)
+    if metadata.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {metadata.get('version')} is not supported (expected {SNAPSHOT_VERSION})")
+
+    subjects = metadata['subjects']
+    n_subjects = len(subjects)
+    students = pd.DataFrame({column: table.column(column).to_numpy(zero_copy_only=False)
+                             for column in STUDENT_COLUMNS})
+    students['Percentage'] = students['Percentage'].astype(float)
+
+    marks = {field: _matrix(table.column(f"marks:{field}"), n_subjects, np.int16) for field in MARK_FIELDS}
+    absent = {field: _matrix(table.column(f"absent:{field}"), n_subjects, bool) for field in MARK_FIELDS}
+    taken = _matrix(table.column("taken"), n_subjects, bool)
+    position = _matrix(table.column("position"), n_subjects, np.int16)
+
+    categories = pd.Index(metadata['status_categories'])
+    status_codes = _matrix(table.column("status"), n_subjects, np.int16)
+    status = pd.DataFrame(status_codes, columns=subjects).apply(
+        lambda column: pd.Categorical.from_codes(column, categories)
+    ) if n_subjects else pd.DataFrame(index=range(len(students)))
+
+    tokens = {}
+    for field in TOKEN_FIELDS:
+        values = np.array(metadata['tokens'][field] or [''], dtype=object)
+        tokens[field] = values[_matrix(table.column(f"tokens:{field}"), n_subjects, np.int32)]
+
+    return ResultDataset(students, subjects, marks, absent, status, tokens, taken, position, key=metadata['key'])
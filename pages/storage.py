@@ -0,0 +1,381 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime
+import pyarrow as pa
+import streamlit as st
+from pages import instrumentation
+from pages.result_dataset import MISSING, build_dataset, parse_mark, short_data
+from pages.snapshot import SNAPSHOT_SUFFIX, read_snapshot, save_snapshot, write_file
+
+# One database shared by every session of the app on this server
+DB_PATH = os.environ.get(
+    "RESULT_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "results.sqlite3")
+)
+# Arrow snapshot of each upload's dataset, memory-mapped when the upload is opened
+SNAPSHOT_DIR = os.environ.get("RESULT_SNAPSHOT_DIR", os.path.join(os.path.dirname(DB_PATH) or ".", "snapshots"))
+# Parsed uploads kept in memory so page switches and reruns never go back to SQLite
+MAX_LOADED_UPLOADS = 8
+# Content hashes looked up per query when matching the pages of a revised PDF
+PAGE_LOOKUP_CHUNK = 500
+# Keys of save_data/load_data that are backed by the database rather than session state
+RESULT_PATHS = ('Result_dict', 'Shoert_data', 'Dataset')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset_key TEXT UNIQUE,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    n_students INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    upload_id INTEGER NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    seat_no TEXT,
+    prn_no TEXT,
+    name TEXT,
+    percentage TEXT,
+    status TEXT,
+    PRIMARY KEY (upload_id, row)
+);
+CREATE TABLE IF NOT EXISTS subject_marks (
+    upload_id INTEGER NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
+    student_row INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    code TEXT,
+    ua TEXT,
+    ca TEXT,
+    total TEXT,
+    total_value INTEGER,
+    status TEXT,
+    PRIMARY KEY (upload_id, student_row, position)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    upload_id INTEGER NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
+    page INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    student_row INTEGER,
+    PRIMARY KEY (upload_id, page)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_content_hash ON pages(content_hash);
+-- Lookups by seat number, PRN or subject go through the in-memory dataset, so these only slowed inserts
+DROP INDEX IF EXISTS idx_students_seat_no;
+DROP INDEX IF EXISTS idx_students_prn_no;
+DROP INDEX IF EXISTS idx_subject_marks_code;
+"""
+
+_lock = threading.Lock()
+_loaded = OrderedDict()
+_initialized = set()
+
+def connect():
+    """Open a connection to the result database, creating the schema on first use"""
+    os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.execute("PRAGMA foreign_keys = ON")
+    if DB_PATH not in _initialized:
+        # WAL lets staff sessions keep reading while an upload is being written
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(_SCHEMA)
+        _initialized.add(DB_PATH)
+    return conn
+
+def save_results(student_info, key=None, name=None, pages=None):
+    """Persist parsed records and make them this session's current results"""
+    upload_id = store_results(student_info, key=key, name=name, pages=pages)
+    st.session_state.upload_id = upload_id
+    return upload_id
+
+def store_results(student_info, key=None, name=None, pages=None):
+    """Bulk insert parsed records (reusing an identical earlier upload) and return the upload id.
+
+    pages lists (page number, content hash, student row or None) for every
+    result page, so a revised PDF can reuse the records of unchanged pages.
+    """
+    with instrumentation.timed("store_results"), closing(connect()) as conn, conn:
+        # Take the write lock before looking for the key, so two jobs storing the same PDF at once
+        # cannot both miss it; the second one then finds and reuses the first one's upload
+        conn.execute("BEGIN IMMEDIATE")
+        existing = conn.execute("SELECT id FROM uploads WHERE dataset_key = ?", (key,)).fetchone() if key else None
+        if existing:
+            upload_id = existing[0]
+        else:
+            upload_id = conn.execute(
+                "INSERT INTO uploads (dataset_key, name, created_at, n_students) VALUES (?, ?, ?, ?)",
+                (key, name, datetime.now().isoformat(timespec="seconds"), len(student_info))
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO students VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((upload_id, row, record.get('Seat No'), record.get('PRN No'), record.get('Name'),
+                  record.get('Percentage'), record.get('Status'))
+                 for row, record in enumerate(student_info))
+            )
+            conn.executemany(
+                "INSERT INTO subject_marks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _subject_mark_rows(upload_id, student_info)
+            )
+            conn.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?, ?)",
+                ((upload_id, page, content_hash, row) for page, content_hash, row in pages or ())
+            )
+
+    views = _result_views(student_info, key)
+    # A new upload's id may still have a snapshot from an older database, so it is always written
+    if not existing or not os.path.exists(_snapshot_path(upload_id)):
+        _save_upload_snapshot(upload_id, views['Dataset'])
+    _remember(upload_id, views)
+    return upload_id
+
+def import_snapshot(data, name=None):
+    """Store a downloaded dataset snapshot as an upload (reusing an identical one) and return its id.
+
+    Only the snapshot is kept, so the upload has a dataset but no per-record
+    rows: its Result_dict/Shoert_data views are empty and it takes no part
+    in page reuse for revised PDFs.
+    """
+    dataset = read_snapshot(data)
+    with instrumentation.timed("import_snapshot"), closing(connect()) as conn, conn:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = conn.execute("SELECT id FROM uploads WHERE dataset_key = ?", (dataset.key,)).fetchone()
+        if existing:
+            upload_id = existing[0]
+        else:
+            upload_id = conn.execute(
+                "INSERT INTO uploads (dataset_key, name, created_at, n_students) VALUES (?, ?, ?, ?)",
+                (dataset.key, name, datetime.now().isoformat(timespec="seconds"), len(dataset))
+            ).lastrowid
+    if not os.path.exists(_snapshot_path(upload_id)):
+        write_file(_snapshot_path(upload_id), lambda f: f.write(data))
+    return upload_id
+
+def _snapshot_path(upload_id):
+    return os.path.join(SNAPSHOT_DIR, f"{upload_id}{SNAPSHOT_SUFFIX}")
+
+def _save_upload_snapshot(upload_id, dataset):
+    try:
+        with instrumentation.timed("write_snapshot"):
+            save_snapshot(dataset, _snapshot_path(upload_id))
+    except (OSError, pa.ArrowException, ValueError):
+        # The database stays the source of truth; without a snapshot the upload is rebuilt from it
+        pass
+
+def _read_upload_snapshot(upload_id, dataset_key, n_students):
+    """The upload's dataset from its snapshot, or None if there is no usable one"""
+    try:
+        with instrumentation.timed("read_snapshot"):
+            dataset = read_snapshot(_snapshot_path(upload_id))
+    except (OSError, pa.ArrowException, ValueError, KeyError):
+        return None
+    # A snapshot left behind by an older database could carry this id for a different upload
+    if len(dataset) != n_students or (dataset_key is not None and dataset.key != dataset_key):
+        return None
+    return dataset
+
+def _subject_mark_rows(upload_id, student_info):
+    for row, record in enumerate(student_info):
+        for position, code in enumerate(record.get('Code', [])):
+            total = record['Total'][position]
+            total_value, _ = parse_mark(total)
+            yield (upload_id, row, position, code, record['UA'][position], record['CA'][position],
+                   total, None if total_value == MISSING else total_value, record['Status1'][position])
+
+def _result_views(student_info, key):
+    with instrumentation.timed("build_dataset"):
+        dataset = build_dataset(student_info, key=key)
+    return {
+        'Result_dict': student_info,
+        'Shoert_data': short_data(student_info),
+        'Dataset': dataset,
+    }
+
+def _remember(upload_id, views):
+    with _lock:
+        _loaded[upload_id] = views
+        _loaded.move_to_end(upload_id)
+        while len(_loaded) > MAX_LOADED_UPLOADS:
+            _loaded.popitem(last=False)
+
+def _load_upload(upload_id):
+    with _lock:
+        views = _loaded.get(upload_id)
+        if views is not None:
+            _loaded.move_to_end(upload_id)
+            return views
+
+    with closing(connect()) as conn:
+        upload = conn.execute("SELECT dataset_key, n_students FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+    if upload is None:
+        return None
+
+    dataset = _read_upload_snapshot(upload_id, *upload)
+    if dataset is not None:
+        # Records are only read from the database if something asks for them (see _upload_view)
+        views = {'Dataset': dataset}
+    else:
+        student_info = _read_records(upload_id)
+        views = _result_views(student_info, upload[0])
+        _save_upload_snapshot(upload_id, views['Dataset'])
+    _remember(upload_id, views)
+    return views
+
+def _upload_view(upload_id, path):
+    """One of RESULT_PATHS for a stored upload, or None if the upload does not exist"""
+    views = _load_upload(upload_id)
+    if views is None:
+        return None
+    if path not in views:
+        student_info = _read_records(upload_id)
+        views.update({'Result_dict': student_info, 'Shoert_data': short_data(student_info)})
+    return views[path]
+
+def _read_records(upload_id):
+    """Per-student records of an upload as the extractor produced them, rebuilt from the database"""
+    with closing(connect()) as conn:
+        students = conn.execute(
+            "SELECT row, seat_no, prn_no, name, percentage, status FROM students WHERE upload_id = ? ORDER BY row",
+            (upload_id,)
+        ).fetchall()
+        marks = conn.execute(
+            "SELECT student_row, code, ua, ca, total, status FROM subject_marks "
+            "WHERE upload_id = ? ORDER BY student_row, position",
+            (upload_id,)
+        ).fetchall()
+    return list(_build_records(students, marks).values())
+
+def _build_records(students, marks):
+    """{key: record} from student rows (key, seat_no, prn_no, name, percentage, status) and
+    their subject rows (key, code, ua, ca, total, status) in position order"""
+    records = {}
+    for key, seat_no, prn_no, name, percentage, status in students:
+        record = {}
+        for field, value in (('Name', name), ('Seat No', seat_no), ('PRN No', prn_no),
+                             ('Status', status), ('Percentage', percentage)):
+            if value is not None:
+                record[field] = value
+        record.update({'Code': [], 'UA': [], 'CA': [], 'Total': [], 'Status1': []})
+        records[key] = record
+
+    for key, code, ua, ca, total, status in marks:
+        record = records[key]
+        record['Code'].append(code)
+        record['UA'].append(ua)
+        record['CA'].append(ca)
+        record['Total'].append(total)
+        record['Status1'].append(status)
+    return records
+
+def list_uploads():
+    """All stored uploads, newest first, as (id, name, created_at, n_students)"""
+    with closing(connect()) as conn:
+        return conn.execute(
+            "SELECT id, name, created_at, n_students FROM uploads ORDER BY id DESC"
+        ).fetchall()
+
+def load_dataset(upload_id):
+    """ResultDataset of any stored upload (kept in memory once loaded), or None if it does not exist"""
+    return _upload_view(upload_id, 'Dataset')
+
+def rename_upload(upload_id, name):
+    """Give a stored upload a display name (e.g. the class and semester) for the comparison page"""
+    with closing(connect()) as conn, conn:
+        conn.execute("UPDATE uploads SET name = ? WHERE id = ?", (name, upload_id))
+
+def parsed_pages(hashes):
+    """Records parsed earlier from pages with these content hashes, as {hash: record or None}.
+
+    None means the page held no student. A hash stored with different
+    records (two pages the hash failed to tell apart) is left out, so
+    those pages are parsed again rather than given another page's student.
+    Only the students on matching pages are read, never whole uploads.
+    """
+    unique = list(set(hashes))
+    places = {}
+    students = []
+    marks = []
+    with closing(connect()) as conn:
+        for start in range(0, len(unique), PAGE_LOOKUP_CHUNK):
+            chunk = unique[start:start + PAGE_LOOKUP_CHUNK]
+            in_chunk = f"content_hash IN ({', '.join('?' * len(chunk))})"
+            matching = f"SELECT DISTINCT upload_id, student_row FROM pages WHERE {in_chunk}"
+            rows = conn.execute(f"SELECT DISTINCT content_hash, upload_id, student_row FROM pages WHERE {in_chunk}", chunk)
+            for content_hash, upload_id, row in rows:
+                places.setdefault(content_hash, set()).add(None if row is None else (upload_id, row))
+            # Pages without a student have a NULL row and join nothing
+            students += conn.execute(
+                f"SELECT s.upload_id, s.row, s.seat_no, s.prn_no, s.name, s.percentage, s.status "
+                f"FROM ({matching}) AS p JOIN students AS s ON s.upload_id = p.upload_id AND s.row = p.student_row",
+                chunk
+            ).fetchall()
+            marks += conn.execute(
+                f"SELECT m.upload_id, m.student_row, m.code, m.ua, m.ca, m.total, m.status "
+                f"FROM ({matching}) AS p JOIN subject_marks AS m "
+                f"ON m.upload_id = p.upload_id AND m.student_row = p.student_row "
+                f"ORDER BY m.upload_id, m.student_row, m.position",
+                chunk
+            ).fetchall()
+
+    found = _build_records((((upload_id, row), *fields) for upload_id, row, *fields in students),
+                           (((upload_id, row), *fields) for upload_id, row, *fields in marks))
+    records = {}
+    for content_hash, stored in places.items():
+        if any(place is not None and place not in found for place in stored):
+            continue
+        candidates = [None if place is None else found[place] for place in stored]
+        if all(record == candidates[0] for record in candidates[1:]):
+            records[content_hash] = candidates[0]
+    return records
+
+def previous_version(upload_id):
+    """The earlier upload this one most likely revises, or None if it shares no pages with one.
+
+    Candidates are ranked by the share of their own pages found in this
+    upload, so a small PDF that happens to repeat a few pages loses to
+    the previous version of the same result.
+    """
+    with closing(connect()) as conn:
+        row = conn.execute(
+            "SELECT other.upload_id FROM pages AS this "
+            "JOIN pages AS other ON other.content_hash = this.content_hash AND other.upload_id < this.upload_id "
+            "JOIN (SELECT upload_id, COUNT(*) AS n_pages FROM pages GROUP BY upload_id) AS sizes "
+            "ON sizes.upload_id = other.upload_id "
+            "WHERE this.upload_id = ? GROUP BY other.upload_id "
+            "ORDER BY COUNT(DISTINCT other.page) * 1.0 / MAX(sizes.n_pages) DESC, other.upload_id DESC LIMIT 1",
+            (upload_id,)
+        ).fetchone()
+    return row[0] if row else None
+
+def select_upload(upload_id):
+    """Switch this session to a previously stored upload"""
+    st.session_state.upload_id = upload_id
+
+def current_upload_id():
+    """The session's upload, defaulting to the most recent one any staff member processed"""
+    upload_id = st.session_state.get('upload_id')
+    if upload_id is None:
+        with closing(connect()) as conn:
+            upload_id = conn.execute("SELECT MAX(id) FROM uploads").fetchone()[0]
+        if upload_id is not None:
+            st.session_state.upload_id = upload_id
+    return upload_id
+
+def save_data(path, info):
+    """Save data - parsed records as a new upload in the shared database, anything else to session state"""
+    if path == 'Result_dict':
+        save_results(info)
+    elif path in RESULT_PATHS:
+        raise ValueError(f"{path} is built from the stored records; save them as Result_dict instead")
+    else:
+        st.session_state.stored_data[path] = info
+
+def load_data(path):
+    """Load data - parsed results from the shared database, anything else from session state"""
+    if path not in RESULT_PATHS:
+        return st.session_state.stored_data.get(path, [])
+
+    upload_id = current_upload_id()
+    view = _upload_view(upload_id, path) if upload_id is not None else None
+    return view if view is not None else []
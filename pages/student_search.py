@@ -2,15 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from pages.result_dataset import subject_code
+from pages.charts import show_chart
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
-
-def student_search(data, detailed_data):
+def student_search(dataset):
     st.header("🔍 Student Search")
     
-    if not data:
+    if not dataset:
         st.warning("No data available. Please upload and process a PDF first.")
         return
     
@@ -20,86 +19,79 @@ def student_search(data, detailed_data):
         st.info("Enter a seat number or name to search")
         return
     
-    results = []
-    for student in data:
-        if (search_term in student["Seat No"].lower() or 
-            search_term in student["Name"].lower()):
-            results.append(student)
+    students = dataset.students
+    index = dataset.search_index
+    results = students.iloc[index.search(search_term)]
+    # An exact Seat No or PRN is among the substring matches; it starts out as the selected student
+    exact = index.lookup(search_term)
     
-    if not results:
+    if results.empty:
         st.warning("No matching students found")
         return
     
     st.success(f"Found {len(results)} matching student(s)")
     
     # Display basic info in a table
-    df = pd.DataFrame(results)
-    st.dataframe(df[['Seat No', 'Name', 'Percentage', 'Status']])
-    
-    # Create selection options
-    options = [f"{res['Seat No']} - {res['Name']}" for res in results]
+    st.dataframe(results[['Seat No', 'Name', 'Percentage', 'Status']])
     
     if len(results) > 1:
-        # Create a select box for multiple results
-        selected_option = st.selectbox(
+        # Create a select box for multiple results; the selected option is the row itself
+        row = st.selectbox(
             "Select a student to view detailed marks:",
-            options,
-            key="student_select"
+            results.index,
+            index=results.index.get_loc(exact) if exact is not None else 0,
+            format_func=lambda row: f"{students.at[row, 'Seat No']} - {students.at[row, 'Name']}",
+            # Keyed by the search, so each new search starts at its exact match (or the first result)
+            key=f"student_select_{search_term}"
         )
-        selected_seat_no = selected_option.split(" - ")[0]
     else:
-        selected_seat_no = results[0]["Seat No"]
+        row = results.index[0]
     
     # Display detailed marks for the selected student
     st.subheader("📝 Detailed Marks")
-    for detailed in detailed_data:
-        if detailed["Seat No"] == selected_seat_no:
-            # Create marks table
-            marks_data = []
-            for i in range(len(detailed["Code"])):
-                marks_data.append({
-                    "Subject": detailed["Code"][i],
-                    "UA": detailed["UA"][i],
-                    "CA": detailed["CA"][i],
-                    "Total": detailed["Total"][i],
-                    "Status": detailed["Status1"][i]
-                })
-            
-            # Display as styled table
-            marks_df = pd.DataFrame(marks_data)
-            st.dataframe(marks_df)
-            
-            # Add visual summary
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Create subject performance chart
-                fig, ax = plt.subplots(figsize=(8, 4))
-                bars = ax.bar(
-                    marks_df['Subject'], 
-                    marks_df['Total'].apply(lambda x: int(x) if x.isdigit() else 0),
-                    color='skyblue'
-                )
-                ax.set_ylabel('Marks')
-                ax.set_title('Subject-wise Marks')
-                ax.set_xticklabels(marks_df['Subject'], rotation=45, ha='right')
-                ax.set_ylim(0, 100)
-                ax.bar_label(bars, fmt='%d', padding=3)
-                st.pyplot(fig)
-            
-            with col2:
-                # Calculate summary stats
-                total_marks = sum([int(x) if x.isdigit() else 0 for x in detailed["Total"]])
-                passed_subjects = sum(1 for status in detailed["Status1"] if status == "P")
-                
-                # Create summary cards
-                st.metric("Total Marks", total_marks)
-                st.metric(f"Passed Subjects", f"{passed_subjects}/{len(detailed['Status1'])}")
-                st.metric("Overall Percentage", detailed["Percentage"] + "%")
-                
-            break
+    cols = dataset.student_subjects(row)
+    marks_df = pd.DataFrame({
+        "Subject": [subject_code(dataset.subjects[col]) for col in cols],
+        "UA": dataset.tokens['UA'][row, cols],
+        "CA": dataset.tokens['CA'][row, cols],
+        "Total": dataset.tokens['Total'][row, cols],
+        "Status": dataset.tokens['Status1'][row, cols]
+    })
+    totals = np.maximum(dataset.marks['Total'][row, cols], 0)
+    
+    # Display as styled table
+    st.dataframe(marks_df)
+    
+    # Add visual summary
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Create subject performance chart
+        def draw():
+            fig, ax = plt.subplots(figsize=(8, 4))
+            bars = ax.bar(
+                marks_df['Subject'], 
+                totals,
+                color='skyblue'
+            )
+            ax.set_ylabel('Marks')
+            ax.set_title('Subject-wise Marks')
+            ax.set_xticklabels(marks_df['Subject'], rotation=45, ha='right')
+            ax.set_ylim(0, 100)
+            ax.bar_label(bars, fmt='%d', padding=3)
+            return fig
+        show_chart(dataset, "student_marks", (int(row),), draw)
+    
+    with col2:
+        # Calculate summary stats
+        total_marks = int(totals.sum())
+        passed_subjects = int((marks_df['Status'] == "P").sum())
+        
+        # Create summary cards
+        st.metric("Total Marks", total_marks)
+        st.metric(f"Passed Subjects", f"{passed_subjects}/{len(marks_df)}")
+        st.metric("Overall Percentage", f"{students.at[row, 'Percentage']:.2f}%")
 
 def show():
-    data = load_data("Shoert_data")
-    detailed_data = load_data("Result_dict")
-    student_search(data, detailed_data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    student_search(dataset)
\ No newline at end of file
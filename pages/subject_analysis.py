@@ -1,76 +1,23 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
+from pages.charts import show_chart
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
-
-def subject_analysis(detailed_data):
+def subject_analysis(dataset):
     st.header("📚 Subject-wise Analysis")
     
-    if not detailed_data:
+    if not dataset:
         st.warning("No detailed data available. Please process a PDF first.")
         return
     
-    # Collect subject data
-    subject_stats = {}
-    
-    for student in detailed_data:
-        for i in range(len(student["Code"])):
-            code = student["Code"][i]
-            total = student["Total"][i]
-            
-            # Skip invalid entries
-            if not isinstance(code, str) or not isinstance(total, str):
-                continue
-            
-            # Initialize subject entry
-            if code not in subject_stats:
-                subject_stats[code] = {
-                    "total_marks": 0,
-                    "count": 0,
-                    "pass_count": 0,
-                    "fail_count": 0
-                }
-            
-            # Process marks
-            try:
-                if total.isdigit():
-                    mark = int(total)
-                    subject_stats[code]["total_marks"] += mark
-                    subject_stats[code]["count"] += 1
-                    
-                    # Check pass/fail status
-                    status = student["Status1"][i]
-                    if status == "P":
-                        subject_stats[code]["pass_count"] += 1
-                    else:
-                        subject_stats[code]["fail_count"] += 1
-            except:
-                continue
+    # Statistics are computed once per dataset over the whole marks matrix
+    stats = dataset.subject_stats
+    df = stats[stats['Students'] > 0].round(2).reset_index(drop=True)
     
-    # Prepare data for display
-    analysis_data = []
-    for code, stats in subject_stats.items():
-        if stats["count"] > 0:
-            avg_mark = stats["total_marks"] / stats["count"]
-            pass_rate = (stats["pass_count"] / stats["count"]) * 100
-            analysis_data.append({
-                "Subject": code,
-                "Avg. Marks": f"{avg_mark:.2f}",
-                "Pass Rate": f"{pass_rate:.2f}%",
-                "Students": stats["count"],
-                "Passed": stats["pass_count"],
-                "Failed": stats["fail_count"]
-            })
-    
-    if not analysis_data:
+    if df.empty:
         st.warning("No valid subject data found")
         return
     
-    df = pd.DataFrame(analysis_data)
-    
     # Display data
     col1, col2 = st.columns([1, 2])
     
@@ -85,24 +32,28 @@ def subject_analysis(detailed_data):
         tab1, tab2 = st.tabs(["Average Marks", "Pass Rate"])
         
         with tab1:
-            fig, ax = plt.subplots(figsize=(8, 4))
-            bars = ax.bar(df['Subject'], df['Avg. Marks'].astype(float), color='skyblue')
-            ax.set_ylabel('Average Marks')
-            ax.set_title('Average Marks per Subject')
-            ax.set_xticklabels(df['Subject'], rotation=45, ha='right')
-            ax.bar_label(bars, fmt='%.2f', padding=3)
-            st.pyplot(fig)
+            def draw():
+                fig, ax = plt.subplots(figsize=(8, 4))
+                bars = ax.bar(df['Subject'], df['Mean'], color='skyblue')
+                ax.set_ylabel('Average Marks')
+                ax.set_title('Average Marks per Subject')
+                ax.set_xticklabels(df['Subject'], rotation=45, ha='right')
+                ax.bar_label(bars, fmt='%.2f', padding=3)
+                return fig
+            show_chart(dataset, "subject_average_marks", (), draw)
         
         with tab2:
-            fig, ax = plt.subplots(figsize=(8, 4))
-            bars = ax.bar(df['Subject'], df['Pass Rate'].str.replace('%', '').astype(float), color='lightgreen')
-            ax.set_ylabel('Pass Rate (%)')
-            ax.set_title('Pass Rate per Subject')
-            ax.set_ylim(0, 100)
-            ax.set_xticklabels(df['Subject'], rotation=45, ha='right')
-            ax.bar_label(bars, fmt='%.1f%%', padding=3)
-            st.pyplot(fig)
+            def draw():
+                fig, ax = plt.subplots(figsize=(8, 4))
+                bars = ax.bar(df['Subject'], df['Pass Rate'], color='lightgreen')
+                ax.set_ylabel('Pass Rate (%)')
+                ax.set_title('Pass Rate per Subject')
+                ax.set_ylim(0, 100)
+                ax.set_xticklabels(df['Subject'], rotation=45, ha='right')
+                ax.bar_label(bars, fmt='%.1f%%', padding=3)
+                return fig
+            show_chart(dataset, "subject_pass_rate", (), draw)
 
 def show():
-    detailed_data = load_data("Result_dict")
-    subject_analysis(detailed_data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    subject_analysis(dataset)
\ No newline at end of file
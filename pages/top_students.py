@@ -1,27 +1,56 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from pages.ranking import OVERALL, TIE_METHODS
+from pages.result_dataset import subject_label, summary_rows
+from pages.charts import show_chart
+from pages.storage import load_data
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
-
-def find_top_ten(data):
-    if not data:
+def find_top_students(dataset):
+    if not dataset:
         st.warning("No data available. Please upload and process a PDF first.")
         return
     
-    top_students = [d for d in data if float(d["Percentage"]) > 89.00]
-    top_students.sort(key=lambda x: float(x["Percentage"]), reverse=True)
+    summary = dataset.summary
+    rankings = dataset.rankings
+    
+    col1, col2, col3 = st.columns(3)
+    subject = col1.selectbox(
+        "Rank by",
+        [OVERALL] + dataset.subjects,
+        format_func=lambda subject: "Overall percentage" if subject is OVERALL else subject_label(subject),
+        key="top_rank_by"
+    )
+    n = int(col2.number_input("Number of students", min_value=1, max_value=max(len(summary), 1),
+                              value=min(10, max(len(summary), 1)), step=1, key="top_n"))
+    method = col3.radio("Ties", TIE_METHODS, format_func=str.title, horizontal=True, key="top_tie_method")
+    scores = rankings.scores(subject)
+    # Subject totals are not out of 100, so the threshold and chart go up to the column's best mark
+    top_mark = 100.0 if subject is OVERALL else float(np.nanmax(scores)) if np.any(~np.isnan(scores)) else 0.0
+    if subject is OVERALL:
+        threshold = st.number_input("Only percentages above", min_value=0.0, max_value=100.0,
+                                    value=89.0, step=0.5, key="top_threshold")
+        score_label, unit = "Percentage", "%"
+    else:
+        threshold = st.number_input("Only subject totals above", min_value=0.0, max_value=top_mark,
+                                    value=0.0, step=1.0, key=f"top_subject_threshold_{subject}")
+        score_label, unit = subject_label(subject), " marks"
+    
+    # Linear-time selection of the top n, ranks come from the per-dataset memo
+    rows, top_scores, ranks = rankings.top(n, np.float32(threshold), subject, method)
     
-    st.subheader("🏆 Top 10 Students")
+    st.subheader(f"🏆 Top {n} Students")
     col1, col2 = st.columns(2)
-    col1.metric("Total Students", len(data))
-    col2.metric("Students with >89%", len(top_students))
+    col1.metric("Total Students", len(summary))
+    col2.metric(f"Students with >{threshold:g}{unit}", int(np.count_nonzero(scores > np.float32(threshold))))
     
-    if top_students:
-        df = pd.DataFrame(top_students[:10])
+    if len(rows):
+        df = summary_rows(summary.iloc[rows])
+        if subject is not OVERALL:
+            # The subject's marks take the percentage column's place
+            df = df.rename(columns={'Percentage': score_label}).assign(**{score_label: top_scores.astype(float)})
+        df.insert(0, 'Rank', ranks)
+        chart_params = (subject, n, threshold, method)
         
         # Use tabs for data and visualization
         tab1, tab2 = st.tabs(["Data", "Visualization"])
@@ -31,35 +60,39 @@ def find_top_ten(data):
         
         with tab2:
             # Create pie chart for top students with consistent size
-            fig, ax = plt.subplots(figsize=(6, 6))
-            wedges, texts, autotexts = ax.pie(
-                df['Percentage'].astype(float),
-                labels=df['Name'].str[:15] + "...",
-                autopct='%1.1f%%',
-                startangle=90,
-                wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-                textprops={'fontsize': 9},
-                colors=plt.colormaps['Pastel1'].colors
-            )
-            plt.setp(autotexts, size=8, weight="bold")
-            ax.set_title('Top 10 Students Percentage Distribution', pad=20)
-            st.pyplot(fig)
+            def draw():
+                fig, ax = plt.subplots(figsize=(6, 6))
+                wedges, texts, autotexts = ax.pie(
+                    df[score_label],
+                    labels=df['Name'].str[:15] + "...",
+                    autopct='%1.1f%%',
+                    startangle=90,
+                    wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+                    textprops={'fontsize': 9},
+                    colors=plt.colormaps['Pastel1'].colors
+                )
+                plt.setp(autotexts, size=8, weight="bold")
+                ax.set_title(f'Top {n} Students {score_label} Distribution', pad=20)
+                return fig
+            show_chart(dataset, "top_students_pie", chart_params, draw)
             
             # Add bar chart for top students
-            fig2, ax2 = plt.subplots(figsize=(8, 4))
-            bars = ax2.barh(
-                df['Name'].str[:20] + "...", 
-                df['Percentage'].astype(float),
-                color=plt.cm.viridis(np.linspace(0, 1, len(df)))
-            )
-            ax2.set_xlabel('Percentage (%)')
-            ax2.set_title('Top 10 Students Performance')
-            ax2.bar_label(bars, fmt='%.2f%%', padding=3)
-            ax2.set_xlim(0, 100)
-            st.pyplot(fig2)
+            def draw():
+                fig2, ax2 = plt.subplots(figsize=(8, 4))
+                bars = ax2.barh(
+                    df['Name'].str[:20] + "...", 
+                    df[score_label],
+                    color=plt.cm.viridis(np.linspace(0, 1, len(df)))
+                )
+                ax2.set_xlabel('Percentage (%)' if subject is OVERALL else f'{score_label} marks')
+                ax2.set_title(f'Top {n} Students Performance')
+                ax2.bar_label(bars, fmt='%.2f%%' if subject is OVERALL else '%d', padding=3)
+                ax2.set_xlim(0, max(top_mark, 1.0))
+                return fig2
+            show_chart(dataset, "top_students_bar", chart_params, draw)
     else:
-        st.info("No students found with percentage > 89%")
+        st.info(f"No students found with {score_label} > {threshold:g}{unit}")
 
 def show():
-    data = load_data("Shoert_data")
-    find_top_ten(data)
\ No newline at end of file
+    dataset = load_data("Dataset")
+    find_top_students(dataset)
\ No newline at end of file
@@ -2,167 +2,554 @@ import streamlit as st
 import pdfplumber
 import pandas as pd
 import re
+import os
+import hashlib
+import time
+import mmap
+import multiprocessing
+import shutil
+import tempfile
+from collections import Counter
+from contextlib import ExitStack, contextmanager
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pages import instrumentation, jobs, parse_cache
+from pages.result_dataset import short_data
+from pages.comparison import mark_changes
+from pages.exports import export_data
+from pages.snapshot import SNAPSHOT_SUFFIX, snapshot_bytes
+from pages.storage import (import_snapshot, list_uploads, load_dataset, parsed_pages, previous_version,
+                           rename_upload, select_upload, store_results)
 
-def extract_student_data_from_bytes(pdf_bytes):
+# Bump whenever parsing output changes so stale cached parses are not reused
+PARSER_VERSION = 1
+
+# The first pages of a university result PDF are cover/summary pages without student data
+FIRST_RESULT_PAGE = 4
+# Below this many result pages, starting a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 40
+SHARDS_PER_WORKER = 4
+# Uploads at least this large are spooled to a temporary file and parsed through mmap
+LOW_MEMORY_MIN_BYTES = int(os.environ.get("RESULT_LOW_MEMORY_MB", "20")) * 1024 * 1024
+SPOOL_CHUNK_BYTES = 1024 * 1024
+# Rows of the sample table rendered while the rest of the PDF is still being parsed
+PREVIEW_ROWS = 5
+
+# Every line is classified with one scan over these precompiled patterns
+_NAME_LINE = re.compile(r'\d+\.\s+[A-Z\s]+')
+_SEAT_NO = re.compile(r'Seat No:\s*(\d+)')
+_SUBJECT_CODES = ['BCA', 'ECS', 'CC-', 'ENG-', 'ENS', 'SEC']
+_LINE_MARKERS = re.compile('|'.join(re.escape(marker) for marker in
+                                    ['Seat No:', 'PRN No.', 'College Code:', 'Status:', 'Percentage:'] + _SUBJECT_CODES))
+_MARKER_KIND = dict.fromkeys(_SUBJECT_CODES, 'subject')
+_MARKER_KIND.update({
+    'Seat No:': 'seat',
+    'PRN No.': 'prn',
+    'College Code:': 'college',
+    'Status:': 'status',
+    'Percentage:': 'percentage',
+})
+# Characters that need the slow path of the marks tokenizer ("* 12", "$ 14 +2", "14 + 2", "+2")
+_MARK_SYMBOLS = re.compile(r'[*$+]')
+
+def tokenize_marks_line(line):
+    """Split a subject marks line into tokens, folding the PDF's mark annotations.
+
+    "* 12" stays one token, "$ 14 +2", "14 + 2" and "+2" become the
+    summed mark, and stray "$"/"+" are dropped.
+    """
+    words = line.split()
+    if not _MARK_SYMBOLS.search(line):
+        return words
+
+    parts = []
+    i = 0
+    n = len(words)
+
+    while i < n:
+        word = words[i]
+
+        # Handle "* 12"
+        if word == '*' and i + 1 < n and words[i + 1].isdigit():
+            parts.append(f'* {words[i + 1]}')
+            i += 2
+
+        # Handle "$ 14 + 2"
+        elif (
+            word == '$' and
+            i + 3 < n and
+            words[i + 1].isdigit() and
+            words[i + 2].startswith('+') and words[i + 2][1:].isdigit()
+        ):
+            parts.append(str(int(words[i + 1]) + int(words[i + 2][1:])))
+            i += 3
+
+        # Handle "14 + 2"
+        elif (
+            word.isdigit() and
+            i + 2 < n and
+            words[i + 1] == '+' and words[i + 2].isdigit()
+        ):
+            parts.append(str(int(word) + int(words[i + 2])))
+            i += 3
+
+        # Handle "+2"
+        elif word.startswith('+') and word[1:].isdigit():
+            parts.append(word[1:])
+            i += 1
+
+        # Skip lone "$" or "+"
+        elif word in ('$', '+'):
+            i += 1
+
+        # Regular token
+        else:
+            parts.append(word)
+            i += 1
+
+    return parts
+
+# Per-subject columns of a student record, in the order marks_from_tokens returns them
+MARK_COLUMNS = ('Code', 'UA', 'CA', 'Total', 'Status1')
+
+def marks_from_tokens(parts):
+    """Pick (code, UA, CA, total, status) out of a tokenized marks line (blank when the line is short)"""
+    n = len(parts)
+    return (
+        parts[0] if n > 0 else '',
+        parts[3] if n > 3 else '',
+        parts[5] if n > 5 else '',
+        parts[8] if n > 8 else '',
+        parts[-2] if n > 12 else ''
+    )
+
+def parse_result_lines(lines):
+    """Single pass over a page's lines, returning (student_info, per-subject mark columns)"""
+    mark_rows = []
+    student_info = {}
+
+    for line in lines:
+        # Extract name (line starting with number and containing name)
+        if _NAME_LINE.fullmatch(line.strip()):
+            student_info['Name'] = line.split('.', 1)[1].strip()
+
+        kinds = {_MARKER_KIND[marker] for marker in _LINE_MARKERS.findall(line)}
+        if not kinds:
+            continue
+
+        # Extract Seat No
+        if 'seat' in kinds and 'prn' in kinds and 'college' in kinds:
+            seat_no_match = _SEAT_NO.search(line)
+            if seat_no_match:
+                student_info['Seat No'] = seat_no_match.group(1)
+
+        # Extract PRN No
+        if 'prn' in kinds:
+            student_info['PRN No'] = line.split('PRN No.')[-1].split()[0].strip()
+
+        # Extract Status
+        if 'status' in kinds:
+            student_info['Status'] = line.split('Status:')[-1].split()[0].strip()
+
+        # Extract Percentage
+        if 'percentage' in kinds:
+            student_info['Percentage'] = line.split('Percentage:')[-1].split('%')[0].strip()
+
+        # Subject marks line
+        if 'subject' in kinds:
+            mark_rows.append(marks_from_tokens(tokenize_marks_line(line)))
+
+    # Transpose the row tuples into one list per column
+    columns = zip(*mark_rows) if mark_rows else [()] * len(MARK_COLUMNS)
+    return student_info, {name: list(values) for name, values in zip(MARK_COLUMNS, columns)}
+
+def parse_student_page(text):
+    """Parse the text of one result page into a student record (None if it is not a student page)"""
+    if "College Code: SANG" not in text:
+        return None
+
+    lines = text.split('\n')
+    instrumentation.count("lines", len(lines))
+    student_info, marks = parse_result_lines(lines)
+    student_info.update(marks)
+    return student_info
+
+def _parse_page(page):
+    with instrumentation.timed("extract_text"):
+        text = page.extract_text()
+    # Drop the page's cached layout objects, otherwise memory grows with every page parsed
+    page.close()
+    instrumentation.count("pages")
+
+    if not text:
+        return None
+
+    with instrumentation.timed("parse_lines"):
+        student_info = parse_student_page(text)
+    if student_info is not None:
+        instrumentation.count("students")
+    return student_info
+
+def _digest_object(obj, digest, memo):
+    """Feed a PDF object into digest, following references; memo holds the digest of each indirect object"""
+    if isinstance(obj, PDFObjRef):
+        if obj.objid not in memo:
+            # An object reached again through itself stands in as a fixed marker
+            memo[obj.objid] = b"cycle"
+            inner = hashlib.sha256()
+            _digest_object(resolve1(obj), inner, memo)
+            memo[obj.objid] = inner.digest()
+        digest.update(b"R" + memo[obj.objid])
+    elif isinstance(obj, PDFStream):
+        _digest_object(obj.attrs, digest, memo)
+        # Encoded bytes while still available, so fonts and images are fingerprinted without being inflated
+        data = obj.rawdata if obj.rawdata is not None else obj.get_data()
+        digest.update(b"stream%d:" % len(data) + data)
+    elif isinstance(obj, dict):
+        digest.update(b"<<%d" % len(obj))
+        for name in sorted(obj, key=str):
+            digest.update(f"/{name}".encode())
+            _digest_object(obj[name], digest, memo)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"[%d" % len(obj))
+        for item in obj:
+            _digest_object(item, digest, memo)
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+def page_hash(page, memo=None):
+    """Fingerprint of a page's content streams, its resources and the parser version.
+
+    Resources are followed into form XObjects and fonts, because pages
+    can share one content stream and differ only in what it draws. A page
+    reissued unchanged in a revised PDF hashes the same, so its earlier
+    parse can be reused; bumping PARSER_VERSION invalidates them all.
+    Pass the same memo for every page of a document so shared fonts and
+    forms are digested once.
+    """
+    memo = {} if memo is None else memo
+    digest = hashlib.sha256(f"v{PARSER_VERSION}".encode())
+    for stream in page.page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+    _digest_object(page.page_obj.resources, digest, memo)
+    return digest.hexdigest()
+
+@contextmanager
+def open_pdf(source):
+    """pdfplumber handle on PDF bytes, or on a file path through a read-only memory map"""
+    if isinstance(source, (bytes, bytearray)):
+        with pdfplumber.open(BytesIO(source)) as pdf:
+            yield pdf
+        return
+
+    with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with pdfplumber.open(mapped) as pdf:
+            yield pdf
+
+# Each pool worker opens its own pdfplumber handle once and reuses it for every shard it receives
+_worker_pdf = None
+_worker_resources = ExitStack()
+
+def _init_worker(source):
+    global _worker_pdf
+    instrumentation.reset()
+    _worker_pdf = _worker_resources.enter_context(open_pdf(source))
+
+def _extract_pages(indices):
+    # The worker's timings and counters travel back with its records
+    records = [_parse_page(_worker_pdf.pages[FIRST_RESULT_PAGE + i]) for i in indices]
+    return records, instrumentation.drain()
+
+def _page_shards(start, stop, workers):
+    """Split [start, stop) into contiguous ranges, a few per worker so slow pages even out"""
+    shard_size = max(1, -(-(stop - start) // (workers * SHARDS_PER_WORKER)))
+    return [(i, min(i + shard_size, stop)) for i in range(start, stop, shard_size)]
+
+def iter_page_records(source, workers=None, reuse=None, mp_context=None):
+    """Yield ``(pages_done, total_pages, page_records)`` while a result PDF is parsed.
+
+    ``page_records`` holds ``(page_number, content_hash, record)`` for the
+    next result pages in page order, record being None for a page without a
+    student. ``reuse``, if given, is called once with the content hashes of
+    result pages (bar hashes repeated within this PDF) and returns
+    ``{hash: record}`` for pages parsed before; those pages are taken from
+    it and only the others are extracted.
+
+    ``source`` is the PDF's bytes or the path of a PDF file, which is
+    memory-mapped rather than read into memory (pool workers map the same
+    file instead of each receiving a copy of the bytes).
+
+    Pages are extracted one at a time, or in page ranges across a process
+    pool when there are enough of them (``workers`` defaults to the CPU
+    count, 1 forces sequential parsing). ``mp_context`` is the
+    multiprocessing context the pool is started with.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with open_pdf(source) as pdf:
+        pages = pdf.pages[FIRST_RESULT_PAGE:]
+        total_pages = len(pages)
+        with instrumentation.timed("hash_pages"):
+            memo = {}
+            hashes = [page_hash(page, memo) for page in pages]
+        # Pages of this PDF sharing a hash are all parsed rather than trusted to hold the same record
+        repeated = {content_hash for content_hash, n in Counter(hashes).items() if n > 1}
+        known = reuse([content_hash for content_hash in hashes if content_hash not in repeated]) \
+            if reuse is not None else {}
+        records = [known.get(content_hash) for content_hash in hashes]
+        todo = [i for i, content_hash in enumerate(hashes) if content_hash not in known]
+        instrumentation.count("pages_reused", total_pages - len(todo))
+
+        def page_batch(start, stop):
+            return [(FIRST_RESULT_PAGE + i, hashes[i], records[i]) for i in range(start, stop)]
+
+        if workers <= 1 or len(todo) < PARALLEL_MIN_PAGES:
+            pages_done = 0
+            for i in todo:
+                records[i] = _parse_page(pages[i])
+                yield i + 1, total_pages, page_batch(pages_done, i + 1)
+                pages_done = i + 1
+            if pages_done < total_pages:
+                yield total_pages, total_pages, page_batch(pages_done, total_pages)
+            return
+
+    shards = [todo[start:stop] for start, stop in _page_shards(0, len(todo), workers)]
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(shards)),
+                               mp_context=mp_context,
+                               initializer=_init_worker,
+                               initargs=(source,))
+    try:
+        pages_done = 0
+        # map() yields in submission order, so shards merge back in page order
+        for shard, (parsed, metrics) in zip(shards, pool.map(_extract_pages, shards)):
+            instrumentation.merge(metrics)
+            for i, record in zip(shard, parsed):
+                records[i] = record
+            # Reused pages between the shards go out with the shard that follows them
+            yield shard[-1] + 1, total_pages, page_batch(pages_done, shard[-1] + 1)
+            pages_done = shard[-1] + 1
+        if pages_done < total_pages:
+            yield total_pages, total_pages, page_batch(pages_done, total_pages)
+    finally:
+        # Don't keep parsing pages nobody will read if the consumer stops early
+        pool.shutdown(cancel_futures=True)
+
+def iter_student_records(source, workers=None, reuse=None):
+    """Yield ``(pages_done, total_pages, records)`` while a result PDF is parsed: the student
+    records of each iter_page_records batch, in page order"""
+    for pages_done, total_pages, page_records in iter_page_records(source, workers, reuse):
+        yield pages_done, total_pages, [record for _, _, record in page_records if record is not None]
+
+def add_page_records(page_records, student_info, pages):
+    """Append a batch from iter_page_records: records to student_info, (page, hash, student row) to pages"""
+    for page_number, content_hash, record in page_records:
+        row = None
+        if record is not None:
+            row = len(student_info)
+            student_info.append(record)
+        pages.append((page_number, content_hash, row))
+
+def extract_student_data_from_bytes(pdf_bytes, workers=None, reuse=None):
+    """Extract every student record from a result PDF (bytes or file path), in page order"""
     student_info_all_with_marks = []
     
     try:
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-           
-            for page in pdf.pages[4:]:  # Focus on the relevant page
-                text = page.extract_text()
-
-                if not text:
-                    continue
-                
-                all_student_data = []
-                student_info = {}
-
-                if "College Code: SANG" in text:
-                    # Extract student personal information
-                    lines = text.split('\n')
-                    for line in lines:
-                        # Extract name (line starting with number and containing name)
-                        if re.match(r'^\d+\.\s+[A-Z\s]+$', line.strip()):
-                            student_info['Name'] = line.split('.', 1)[1].strip()
-                        
-                        # Extract Seat No
-                        if 'Seat No:' in line and 'PRN No.' in line and 'College Code:' in line:
-                            seat_no_match = re.search(r'Seat No:\s*(\d+)', line)
-                            if seat_no_match:
-                                student_info['Seat No'] = seat_no_match.group(1)
-                            
-                        # Extract PRN No
-                        if 'PRN No.' in line:
-                            student_info['PRN No'] = line.split('PRN No.')[-1].split()[0].strip()
-                        
-                        # Extract Status
-                        if 'Status:' in line:
-                            student_info['Status'] = line.split('Status:')[-1].split()[0].strip()
-                        
-                        # Extract Percentage
-                        if 'Percentage:' in line:
-                            percentage_part = line.split('Percentage:')[-1].split('%')[0].strip()
-                            student_info['Percentage'] = f"{percentage_part}"
-
-                    for line in lines:
-                        if any(code in line for code in ['BCA', 'ECS', 'CC-', 'ENG-', 'ENS', 'SEC']):
-                            words = line.split()
-                            parts = []
-                            i = 0
-
-                            while i < len(words):
-                                # Handle "* 12"
-                                if words[i] == '*' and i + 1 < len(words) and words[i + 1].isdigit():
-                                    parts.append(f'* {words[i + 1]}')
-                                    i += 2
-
-                                # Handle "$ 14 + 2"
-                                elif (
-                                    words[i] == '$' and
-                                    i + 3 < len(words) and
-                                    words[i + 1].isdigit() and
-                                    words[i + 2].startswith('+') and words[i + 2][1:].isdigit()
-                                ):
-                                    sum_val = int(words[i + 1]) + int(words[i + 2][1:])
-                                    parts.append(str(sum_val))
-                                    i += 3
-
-                                # Handle "14 + 2"
-                                elif (
-                                    words[i].isdigit() and
-                                    i + 2 < len(words) and
-                                    words[i + 1] == '+' and words[i + 2].isdigit()
-                                ):
-                                    sum_val = int(words[i]) + int(words[i + 2])
-                                    parts.append(str(sum_val))
-                                    i += 3
-
-                                # Handle "+2"
-                                elif words[i].startswith('+') and words[i][1:].isdigit():
-                                    parts.append(words[i][1:])
-                                    i += 1
-
-                                # Skip lone "$" or "+"
-                                elif words[i] in ['$', '+']:
-                                    i += 1
-
-                                # Regular token
-                                else:
-                                    parts.append(words[i])
-                                    i += 1
-
-                            # Safe fallback if length is insufficient
-                            try:
-                                data = {
-                                    'Code': parts[0] if len(parts) > 0 else '',
-                                    'UA': parts[3] if len(parts) > 3 else '',
-                                    'CA': parts[5] if len(parts) > 5 else '',
-                                    'Total': parts[8] if len(parts) > 8 else '',
-                                    'Status': parts[-2] if len(parts) > 12 else ''
-                                }
-                                all_student_data.append(data)
-                            except IndexError:
-                                continue
-
-                    all_Data = pd.DataFrame(all_student_data)
-                    combined_dict = {
-                        'Code': all_Data['Code'].tolist(),
-                        'UA': all_Data['UA'].tolist(),
-                        'CA': all_Data['CA'].tolist(),
-                        'Total': all_Data['Total'].tolist(),
-                        'Status1': all_Data['Status'].tolist()
-                    }
-
-                    student_info.update(combined_dict)
-                    student_info_all_with_marks.append(student_info)
-
+        for _, _, records in iter_student_records(pdf_bytes, workers, reuse):
+            student_info_all_with_marks.extend(records)
     except Exception as e:
         st.error(f"Error processing PDF: {e}")
         return None
     
     return student_info_all_with_marks
 
-def save_data(path, info):
-    """Save data to session state"""
-    st.session_state.stored_data[path] = info
+def spool_upload(uploaded_file):
+    """Copy an upload to a temporary file in chunks so its pages can be read through mmap"""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spooled:
+        shutil.copyfileobj(uploaded_file, spooled, SPOOL_CHUNK_BYTES)
+    return spooled.name
+
+def process_upload(job_id, source, name, low_memory=False):
+    """Background job: parse an uploaded PDF (bytes, or a spooled file removed afterwards) and store it.
+
+    Progress goes to the job as pages are parsed; the stored upload's id
+    and a sample of its students come back as the job's result.
+    """
+    try:
+        key = parse_cache.file_cache_key(source, PARSER_VERSION) if low_memory \
+            else parse_cache.cache_key(source, PARSER_VERSION)
+        cached = parse_cache.get(key)
+
+        # Pages already parsed for an earlier upload (e.g. the PDF before revaluation) are not extracted again
+        known_pages = {}
+        def reuse(hashes):
+            known_pages.update(parsed_pages(hashes))
+            return known_pages
+
+        if cached is not None:
+            student_info, pages = cached['Result_dict'], cached.get('Pages')
+        else:
+            student_info, pages = [], []
+            with instrumentation.timed("parse_pdf"):
+                # Forking from a thread of the multithreaded server could copy a lock another thread holds
+                for pages_done, total_pages, page_records in iter_page_records(
+                        source, workers=jobs.page_workers(), reuse=reuse,
+                        mp_context=multiprocessing.get_context("forkserver")):
+                    add_page_records(page_records, student_info, pages)
+                    jobs.update(job_id, pages_done=pages_done, total_pages=total_pages, students=len(student_info),
+                                preview=short_data(student_info[:PREVIEW_ROWS]))
+            if not student_info:
+                raise ValueError("No student data found in the PDF.")
+            parse_cache.put(key, {'Result_dict': student_info, 'Shoert_data': short_data(student_info), 'Pages': pages})
+    finally:
+        if low_memory:
+            os.remove(source)
 
-def load_data(path):
-    """Load data from session state"""
-    return st.session_state.stored_data.get(path, [])
+    upload_id = store_results(student_info, key=key, name=name, pages=pages)
+    return {
+        'upload_id': upload_id,
+        'cached': cached is not None,
+        'students': len(student_info),
+        'total_pages': len(pages) if pages else None,
+        'reused_pages': sum(content_hash in known_pages for _, content_hash, _ in pages or ()),
+        'preview': short_data(student_info[:PREVIEW_ROWS]),
+    }
+
+def show_revision_changes(upload_id, reused_pages, total_pages):
+    """After a revised PDF is stored: how much was reused and which students' results changed"""
+    base_id = previous_version(upload_id)
+    if base_id is None:
+        return
+    names = {upload: name or 'Untitled' for upload, name, _, _ in list_uploads()}
+    st.info(f"♻️ {reused_pages} of {total_pages} pages are unchanged from {names.get(base_id, 'an earlier upload')}; "
+            f"only {total_pages - reused_pages} were re-read.")
+
+    changes = mark_changes(load_dataset(base_id), load_dataset(upload_id))
+    if changes.empty:
+        st.write("No student's result changed.")
+    else:
+        st.subheader(f"{len(changes)} student(s) changed")
+        st.dataframe(changes.round(2), hide_index=True)
 
 def store_data(uploaded_file):
     if uploaded_file is None:
         st.warning("Please upload a PDF file first.")
         return
     
-    with st.spinner("Processing PDF..."):
-        # Process directly from uploaded file bytes
-        pdf_bytes = uploaded_file.getvalue()
-        student_info = extract_student_data_from_bytes(pdf_bytes)
-        
-        if not student_info:
-            st.error("No student data found in the PDF.")
-            return
-        
-        data = []
-        for record in student_info:
-            data.append({
-                "Seat No": record['Seat No'], 
-                "Name": record['Name'], 
-                "Percentage": record['Percentage'], 
-                "Status": record['Status']
-            })
-        
-        save_data('Result_dict', student_info)
-        save_data("Shoert_data", data)
+    # Large uploads are spooled to disk and memory-mapped instead of parsed from an in-memory copy
+    low_memory = uploaded_file.size >= LOW_MEMORY_MIN_BYTES
+    source = spool_upload(uploaded_file) if low_memory else uploaded_file.getvalue()
+
+    # Parsing runs on a job thread, so this session (and every other one) stays responsive meanwhile
+    job_id = jobs.submit(uploaded_file.name, process_upload, source, uploaded_file.name, low_memory)
+    if job_id is None:
+        if low_memory:
+            os.remove(source)
+        st.error("Too many PDFs are being processed right now. Please try again once one has finished.")
+        return
+    st.session_state.upload_job = job_id
+
+@st.fragment(run_every=1)
+def show_upload_job():
+    """Progress of this session's upload job, polled every second until it finishes"""
+    job = jobs.get_job(st.session_state.upload_job)
+    if job is None:
+        st.session_state.upload_job = None
+        return
+    if job['status'] not in jobs.ACTIVE:
+        # Results are shown by a full rerun, which also stops this fragment polling
+        st.session_state.upload_job = None
+        st.session_state.finished_upload_job = job['id']
+        st.rerun()
+
+    if job['status'] == jobs.QUEUED:
+        st.info(f"⏳ {job['name']} is waiting for another PDF to finish processing...")
+    elif not job.get('total_pages'):
+        st.progress(0.0, text="Reading PDF...")
+    else:
+        pages_done, total_pages, students = job['pages_done'], job['total_pages'], job['students']
+        rate = students / max(time.time() - job['started_at'], 1e-6)
+        st.progress(pages_done / total_pages,
+                    text=f"Pages {pages_done}/{total_pages} · {students} students · {rate:.1f} students/sec")
+        if job['preview']:
+            st.subheader("Sample Data")
+            st.dataframe(pd.DataFrame(job['preview']))
+    st.caption("Processing continues if you leave this page; its progress is listed under Background Jobs.")
+
+def show_job_result(job):
+    """Outcome of a finished upload job, which becomes this session's results if it succeeded"""
+    if job['status'] == jobs.FAILED:
+        st.error(f"Error processing PDF: {job['error']}")
+        return
+    select_upload(job['upload_id'])
+    if job['cached']:
+        st.success("✅ This PDF was already processed - loaded saved results.")
+    else:
         st.success("✅ All data saved successfully!")
-        st.subheader("Sample Data")
-        st.dataframe(pd.DataFrame(data).head())
+    st.subheader("Sample Data")
+    st.dataframe(pd.DataFrame(job['preview']))
+    if job['reused_pages']:
+        show_revision_changes(job['upload_id'], job['reused_pages'], job['total_pages'])
+
+def show_saved_uploads():
+    uploads = list_uploads()
+    if not uploads:
+        return
+
+    st.subheader("Previously Processed Results")
+    options = {f"{name or 'Untitled'} · {n_students} students · {created_at}": upload_id
+               for upload_id, name, created_at, n_students in uploads}
+    choice = st.selectbox("Open results another session already processed", list(options), key="saved_upload")
+    if st.button("Open Results"):
+        select_upload(options[choice])
+        st.success(f"✅ Opened {choice}")
+
+    # Names identify datasets on the comparison page, so semesters can be labelled after upload
+    names = {upload_id: name for upload_id, name, _, _ in uploads}
+    new_name = st.text_input("Dataset name", value=names[options[choice]] or "", key=f"saved_upload_name_{options[choice]}")
+    if st.button("Rename") and new_name.strip():
+        rename_upload(options[choice], new_name.strip())
+        st.success(f"✅ Renamed to {new_name.strip()}")
+
+    # A snapshot can be loaded back on the Upload page (here or on another server) without the PDF
+    upload_id = options[choice]
+    def snapshot():
+        # The upload is only loaded once someone downloads it, not on every render of this page
+        dataset = load_dataset(upload_id)
+        return export_data(dataset, "snapshot", (), lambda: snapshot_bytes(dataset))
+    st.download_button(
+        label="📥 Download Dataset Snapshot",
+        data=snapshot,
+        file_name=f"{os.path.splitext(names[upload_id] or 'results')[0]}{SNAPSHOT_SUFFIX}",
+        mime="application/vnd.apache.arrow.file",
+        key="snapshot_download",
+        on_click="ignore"
+    )
+
+def load_snapshot(snapshot_file):
+    """Store an uploaded dataset snapshot and make it this session's results"""
+    try:
+        upload_id = import_snapshot(snapshot_file.getvalue(), name=snapshot_file.name)
+    except (ValueError, OSError) as e:
+        st.error(f"Could not load snapshot: {e}")
+        return
+    select_upload(upload_id)
+    st.success(f"✅ Loaded {len(load_dataset(upload_id))} students from the snapshot")
 
 def show():
     st.header("📤 Upload Result PDF")
     uploaded_file = st.file_uploader("Choose a PDF file", type="pdf")
     if st.button("Process PDF"):
-        store_data(uploaded_file)
\ No newline at end of file
+        store_data(uploaded_file)
+    if st.session_state.get('upload_job') is not None:
+        show_upload_job()
+    finished_job = jobs.get_job(st.session_state.pop('finished_upload_job', None))
+    if finished_job is not None:
+        show_job_result(finished_job)
+
+    snapshot_file = st.file_uploader("Or load a dataset snapshot downloaded earlier", type=SNAPSHOT_SUFFIX.lstrip("."),
+                                     key="snapshot_file")
+    if snapshot_file is not None and st.button("Load Snapshot"):
+        load_snapshot(snapshot_file)
+    show_saved_uploads()
\ No newline at end of file